@@ -3,11 +3,23 @@ ShivAI Atlas - Android Bridge
 ADB-based Android device control and automation
 """
 
+import os
+import shutil
+import socket
 import subprocess
+import asyncio
+import inspect
 import re
+import base64
 import time
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Callable, NamedTuple
 from pathlib import Path
+from types import MappingProxyType
 import logging
 
 from ..core.config import config
@@ -16,13 +28,179 @@ from ..core.permissions import permission_manager, PermissionType, RiskLevel
 
 logger = get_logger(__name__)
 
+# Local adb server; ANDROID_ADB_SERVER_PORT overrides the port as for the adb client
+_ADB_SERVER_ADDRESS = ("127.0.0.1", int(os.environ.get("ANDROID_ADB_SERVER_PORT", 5037)))
+
+# CPython spawns children via posix_spawn instead of fork()+exec() only when
+# close_fds is False and the executable path has a directory; fork of a large
+# agent process is costly. Our own fds are non-inheritable anyway (PEP 446)
+_SPAWN_KWARGS: Dict[str, Any] = {"close_fds": False} if os.name == "posix" else {}
+
+# Marker echoed after every command on the persistent shell, followed by its exit code
+_SHELL_SENTINEL = "__ATLAS_RC__"
+_SENTINEL_RE = re.compile(rb"__ATLAS_RC__(\d+)\s*$")
+# Echoed to stderr first, so we know when a command's error output is complete
+_STDERR_SENTINEL = b"__ATLAS_ERR__"
+
+# Device properties reported by get_device_info
+_DEVICE_INFO_PROPS = {
+    "model": "ro.product.model",
+    "android_version": "ro.build.version.release",
+    "manufacturer": "ro.product.manufacturer",
+    "serial": "ro.serialno",
+}
+_DEVICE_INFO_COMMAND = "; echo ---; ".join(f"getprop {prop}" for prop in _DEVICE_INFO_PROPS.values())
+
+# Fields extracted from `dumpsys battery` in a single pass
+_BATTERY_RE = re.compile(
+    rb"^\s*(level|status|health|voltage|temperature|technology):\s*(\S+)", re.MULTILINE
+)
+
+# ADBKeyboard IME; text broadcast to it skips the `input` app_process start
+_ADB_KEYBOARD_IME = "com.android.adbkeyboard/.AdbIME"
+
+# `wm size` prints "Physical size: WxH" and, when set, a later "Override size: WxH"
+_SIZE_RE = re.compile(r"(\d+)x(\d+)")
+
+# Waits on-device (up to 10 x 50 ms) until `dumpsys power` reports the screen awake
+_WAIT_AWAKE_SCRIPT = (
+    "i=0; while [ $i -lt 10 ] && ! dumpsys power | grep -q mWakefulness=Awake; "
+    "do sleep 0.05; i=$((i+1)); done"
+)
+
+# Resolves the active screen size on-device when it is not cached yet
+_SCREEN_SIZE_SCRIPT = (
+    "size=$(wm size | grep -o '[0-9]*x[0-9]*' | tail -n 1); [ -n \"$size\" ] && "
+    "w=${size%x*} && h=${size#*x}"
+)
+
+# Friendly app names accepted by open_app
+_COMMON_APPS = MappingProxyType({
+    "whatsapp": "com.whatsapp",
+    "telegram": "org.telegram.messenger",
+    "chrome": "com.android.chrome",
+    "youtube": "com.google.android.youtube",
+    "camera": "com.android.camera",
+    "settings": "com.android.settings",
+    "gallery": "com.google.android.apps.photos",
+    "maps": "com.google.android.apps.maps"
+})
+
+# Android keycodes
+_KEY_HOME = 3
+_KEY_BACK = 4
+_KEY_POWER = 26
+_KEY_MENU = 82
+
+# Linux input event codes used for direct touch injection
+_EV_SYN = 0
+_EV_KEY = 1
+_EV_ABS = 3
+_BTN_TOUCH = 330
+_ABS_MT_POSITION_X = 53
+_ABS_MT_POSITION_Y = 54
+_ABS_MT_TRACKING_ID = 57
+
+# Touch axis ranges and device node in `getevent -pl` output
+_INPUT_NODE_RE = re.compile(r"/dev/input/event\d+")
+_TOUCH_AXIS_RE = re.compile(r"ABS_MT_POSITION_([XY])\s*:.*?\bmax (\d+)")
+
+# Package names in `pm list packages` output
+_PACKAGE_RE = re.compile(rb"^package:(\S+)", re.MULTILINE)
+
+class AdbResult(NamedTuple):
+    """Outcome of an ADB command; out holds stdout on success, else the error output"""
+    ok: bool
+    out: Any
+    rc: int
+
+# How long a granted permission is reused before asking permission_manager again
+_PERMISSION_CACHE_TTL = 2.0
+
+def _reports_errors(method):
+    """Return an unexpected exception from an AndroidBridge action as the usual error dict"""
+    what = method.__name__.replace("_", " ")
+    
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await method(self, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to {what}: {e}")
+                return {"success": False, "message": str(e)}
+        return async_wrapper
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to {what}: {e}")
+            return {"success": False, "message": str(e)}
+    return wrapper
+
+def _guarded(action: str, risk_level: RiskLevel,
+             params: Optional[Callable[..., dict]] = None,
+             needs_connection: bool = True):
+    """
+    Decorate an AndroidBridge action with the connection and permission checks
+    (and _reports_errors); params builds the permission params from the
+    method's arguments
+    """
+    def guard(self, args, kwargs) -> Optional[Dict[str, Any]]:
+        if needs_connection and not self.connected:
+            return {"success": False, "message": "No device connected"}
+        
+        action_params = params(*args, **kwargs) if params else None
+        if not self._check_permission(action, risk_level, action_params):
+            return {"success": False, "message": "Permission denied"}
+        return None
+    
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                return guard(self, args, kwargs) or await method(self, *args, **kwargs)
+            return _reports_errors(async_wrapper)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return guard(self, args, kwargs) or method(self, *args, **kwargs)
+        return _reports_errors(wrapper)
+    return decorator
+
 class AndroidBridge:
     """Android device control via ADB"""
     
     def __init__(self):
-        self.adb_path = config.android.adb_path or "adb"
+        adb_path = config.android.adb_path or "adb"
+        self.adb_path = shutil.which(adb_path) or adb_path
         self.device_id = config.android.device_id
         self.connected = False
+        
+        # Long-lived `adb shell` session shared by all shell commands
+        self._shell: Optional[subprocess.Popen] = None
+        self._shell_device: Optional[str] = None
+        self._shell_lines: Optional[queue.Queue] = None
+        self._shell_errors: Optional[queue.Queue] = None
+        self._shell_lock = threading.RLock()
+        
+        # Values that cannot change while the same device stays connected
+        self._prop_cache: Dict[str, str] = {}
+        self._screen_size: Optional[Tuple[int, int]] = None
+        self._adb_keyboard: Optional[bool] = None
+        # (event node, max x, max y) of the touchscreen; False once known unusable
+        self._touch_device: Any = None
+        
+        self._perm_revision = config.revision
+        self._trust_all = config.android.trust_all_permissions
+        
+        # Set once `adb start-server` has run, before the first server socket use
+        self._server_ready = False
+        
+        # Workers for independent commands run concurrently by run_batch
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="adb")
         logger.info("AndroidBridge initialized")
     
     def _check_permission(self, action: str, risk_level: RiskLevel, params: dict = None) -> bool:
@@ -31,37 +209,266 @@ class AndroidBridge:
             logger.warning("Android bridge is disabled in settings")
             return False
         
-        granted, reason = permission_manager.check_permission(
-            PermissionType.ANDROID, action, risk_level, params or {}
+        if self._perm_revision != config.revision:
+            self._perm_revision = config.revision
+            self._trust_all = config.android.trust_all_permissions
+        
+        if self._trust_all:
+            return True
+        
+        granted, reason = permission_manager.check_permission_cached(
+            PermissionType.ANDROID, action, risk_level, params, ttl=_PERMISSION_CACHE_TTL
         )
         if not granted:
             logger.warning(f"Permission denied for {action}: {reason}")
         return granted
     
-    def _run_adb_command(self, command: List[str], timeout: int = 30) -> tuple[bool, str]:
-        """Execute ADB command"""
+    def _run_adb_command(self, command: List[str], timeout: int = 30,
+                         binary: bool = False) -> AdbResult:
+        """
+        Execute ADB command
+        With binary=True successful output is returned as undecoded bytes
+        """
+        if command and command[0] == "shell":
+            return self._run_shell_command(" ".join(command[1:]), timeout, binary)
+        return self._run_adb_process(command, timeout, binary)
+    
+    def _run_adb_process(self, command: List[str], timeout: int = 30,
+                         binary: bool = False) -> AdbResult:
+        """Execute ADB command in a dedicated adb client process"""
+        cmd = [self.adb_path]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.extend(command)
+        
         try:
-            cmd = [self.adb_path]
-            if self.device_id:
-                cmd.extend(["-s", self.device_id])
-            cmd.extend(command)
-            
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                timeout=timeout
+                text=not binary,
+                timeout=timeout,
+                check=False,
+                **_SPAWN_KWARGS
             )
+        except subprocess.TimeoutExpired:
+            return AdbResult(False, "Command timed out", -1)
+        except OSError as e:
+            # adb binary missing or not executable
+            return AdbResult(False, str(e), -1)
+        
+        if result.returncode == 0:
+            return AdbResult(True, result.stdout, 0)
+        error = result.stderr or result.stdout
+        if binary:
+            error = error.decode("utf-8", "replace")
+        return AdbResult(False, error, result.returncode)
+    
+    def run_batch(self, commands: List[List[str]], timeout: int = 30) -> List[AdbResult]:
+        """
+        Execute independent ADB commands concurrently
+        Returns results in the same order as commands
+        """
+        # Each command gets its own adb client process; the adb server
+        # multiplexes them, whereas the persistent shell would serialize them
+        return list(self._pool.map(lambda command: self._run_adb_process(command, timeout), commands))
+    
+    # ==================== ADB SERVER SOCKET ====================
+    
+    def _adb_service(self, service: str, timeout: int = 30) -> bytes:
+        """
+        Run a one-shot service directly on the adb server socket
+        Speaks the same wire protocol as the adb client, without spawning it.
+        Raises OSError when the server is unreachable or refuses the request
+        """
+        if not self._server_ready:
+            self._run_adb_process(["start-server"], timeout=10)
+            self._server_ready = True
+        
+        with socket.create_connection(_ADB_SERVER_ADDRESS, timeout=timeout) as sock:
+            if service.startswith("host:"):
+                self._adb_request(sock, service)
+                length = int(self._recv_exact(sock, 4), 16)
+                return self._recv_exact(sock, length)
             
-            if result.returncode == 0:
-                return True, result.stdout
-            else:
-                return False, result.stderr
+            transport = f"host:transport:{self.device_id}" if self.device_id else "host:transport-any"
+            self._adb_request(sock, transport)
+            self._adb_request(sock, service)
+            
+            # Device services stream their output until the connection closes
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+    
+    @classmethod
+    def _adb_request(cls, sock: socket.socket, request: str):
+        """Send a length-prefixed request and check the OKAY/FAIL status"""
+        payload = request.encode("utf-8")
+        sock.sendall(b"%04x%s" % (len(payload), payload))
+        status = cls._recv_exact(sock, 4)
+        if status != b"OKAY":
+            length = int(cls._recv_exact(sock, 4), 16)
+            raise ConnectionError(cls._recv_exact(sock, length).decode("utf-8", "replace"))
+    
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        """Read exactly size bytes from the socket"""
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("adb server closed the connection")
+            data += chunk
+        return data
+    
+    def _exec_out(self, command: str, timeout: int = 30) -> AdbResult:
+        """Run a device command and return its raw stdout bytes"""
+        try:
+            return AdbResult(True, self._adb_service(f"exec:{command}", timeout), 0)
+        except OSError as e:
+            logger.debug(f"adb server socket unavailable, using adb client: {e}")
+            return self._run_adb_process(["exec-out", *command.split()], timeout, binary=True)
+    
+    # ==================== PERSISTENT SHELL ====================
+    
+    def _open_shell(self):
+        """Start the persistent `adb shell` session for the current device"""
+        cmd = [self.adb_path]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.append("shell")
         
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out"
-        except Exception as e:
-            return False, str(e)
+        self._shell = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            **_SPAWN_KWARGS
+        )
+        self._shell_device = self.device_id
+        self._shell_lines = queue.Queue()
+        self._shell_errors = queue.Queue()
+        
+        # Pipes have no portable read timeout, so daemon threads feed queues;
+        # stderr stays separate so it never mixes into output callers parse
+        for stream, lines in ((self._shell.stdout, self._shell_lines),
+                              (self._shell.stderr, self._shell_errors)):
+            threading.Thread(
+                target=self._pump_shell_output, args=(stream, lines), daemon=True
+            ).start()
+    
+    @staticmethod
+    def _pump_shell_output(stream, lines: queue.Queue):
+        """Forward shell output lines to the queue; None marks end of stream"""
+        for line in iter(stream.readline, b""):
+            lines.put(line)
+        lines.put(None)
+    
+    def _close_shell(self):
+        """Terminate the persistent shell session"""
+        with self._shell_lock:
+            shell, self._shell = self._shell, None
+            self._shell_device = None
+            self._shell_lines = None
+            self._shell_errors = None
+        if shell is not None and shell.poll() is None:
+            try:
+                shell.stdin.close()
+                shell.wait(timeout=2)
+            except Exception:
+                shell.kill()
+    
+    @staticmethod
+    def _time_left(deadline: float) -> float:
+        """Seconds until deadline; raises queue.Empty once it has passed"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise queue.Empty
+        return remaining
+    
+    def _drain_shell_errors(self, deadline: Optional[float]) -> bytes:
+        """The current command's stderr, read up to the stderr sentinel.
+        
+        With no deadline, only what has already arrived is taken.
+        """
+        errors = []
+        while True:
+            try:
+                if deadline is None:
+                    line = self._shell_errors.get_nowait()
+                else:
+                    line = self._shell_errors.get(timeout=self._time_left(deadline))
+            except queue.Empty:
+                if deadline is None:
+                    break
+                raise
+            if line is None:
+                break
+            marker = line.find(_STDERR_SENTINEL)
+            if marker != -1:
+                errors.append(line[:marker])
+                break
+            errors.append(line)
+        return b"".join(errors)
+    
+    def _run_shell_command(self, command: str, timeout: int = 30,
+                           binary: bool = False) -> AdbResult:
+        """Run a command on the persistent shell and read output up to the sentinel"""
+        with self._shell_lock:
+            try:
+                if (self._shell is None or self._shell.poll() is not None
+                        or self._shell_device != self.device_id):
+                    self._close_shell()
+                    self._open_shell()
+                
+                self._shell.stdin.write(
+                    f"{command}; __atlas_rc=$?; echo {_STDERR_SENTINEL.decode()} >&2; "
+                    f"echo {_SHELL_SENTINEL}$__atlas_rc\n".encode("utf-8")
+                )
+                self._shell.stdin.flush()
+                
+                output = []
+                # Devices without the v2 shell protocol merge stderr into stdout
+                stderr_done = False
+                deadline = time.monotonic() + timeout
+                while True:
+                    line = self._shell_lines.get(timeout=self._time_left(deadline))
+                    if line is None:
+                        # Shell exited (device gone, adb error); it is reopened on next call
+                        errors = self._drain_shell_errors(None)
+                        self._close_shell()
+                        message = errors or b"".join(output)
+                        return AdbResult(False, message.decode("utf-8", "replace").strip(), -1)
+                    
+                    marker = line.find(_STDERR_SENTINEL)
+                    if marker != -1:
+                        line = line[:marker]
+                        stderr_done = True
+                    
+                    match = _SENTINEL_RE.search(line)
+                    if match:
+                        output.append(line[:match.start()])
+                        errors = b"" if stderr_done else self._drain_shell_errors(deadline)
+                        data = b"".join(output)
+                        rc = int(match.group(1))
+                        if binary and rc == 0:
+                            return AdbResult(True, data, 0)
+                        if rc != 0 and errors.strip():
+                            data = errors
+                        return AdbResult(rc == 0, data.decode("utf-8", "replace"), rc)
+                    output.append(line)
+            
+            except queue.Empty:
+                # Output of the timed-out command would leak into the next one
+                self._close_shell()
+                return AdbResult(False, "Command timed out", -1)
+            except OSError as e:
+                # adb missing, or the pipe broke under us
+                self._close_shell()
+                return AdbResult(False, str(e), -1)
     
     # ==================== CONNECTION ====================
     
@@ -72,7 +479,8 @@ class AndroidBridge:
                 [self.adb_path, "version"],
                 capture_output=True,
                 text=True,
-                timeout=5
+                timeout=5,
+                **_SPAWN_KWARGS
             )
             
             if result.returncode == 0:
@@ -87,20 +495,32 @@ class AndroidBridge:
     def list_devices(self) -> Dict[str, Any]:
         """List connected Android devices"""
         try:
-            success, output = self._run_adb_command(["devices"])
-            
-            if not success:
-                return {"success": False, "message": output}
+            # `-l` adds product/model/transport details at no extra cost
+            try:
+                lines = self._adb_service("host:devices-l").decode("utf-8", "replace").splitlines()
+            except OSError:
+                result = self._run_adb_command(["devices", "-l"])
+                
+                if not result.ok:
+                    return {"success": False, "message": result.out}
+                
+                # Skip the "List of devices attached" header without copying the list
+                lines = itertools.islice(result.out.splitlines(), 1, None)
             
             devices = []
-            for line in output.split('\n')[1:]:
+            for line in lines:
                 if line.strip():
                     parts = line.split()
                     if len(parts) >= 2:
-                        devices.append({
+                        device = {
                             "id": parts[0],
                             "status": parts[1]
-                        })
+                        }
+                        for part in parts[2:]:
+                            key, sep, value = part.partition(":")
+                            if sep:
+                                device[key] = value
+                        devices.append(device)
             
             return {"success": True, "devices": devices, "count": len(devices)}
         
@@ -108,10 +528,14 @@ class AndroidBridge:
             logger.error(f"Failed to list devices: {e}")
             return {"success": False, "message": str(e)}
     
+    @_reports_errors
     def connect_device(self, device_id: Optional[str] = None) -> Dict[str, Any]:
         """Connect to a device"""
-        try:
-            # List devices first
+        # A known device id goes straight to the probe; `adb devices` can
+        # take seconds on Windows, so only list when there is no candidate
+        if device_id or self.device_id:
+            self.device_id = device_id or self.device_id
+        else:
             devices_result = self.list_devices()
             if not devices_result["success"]:
                 return devices_result
@@ -120,10 +544,7 @@ class AndroidBridge:
             if not devices:
                 return {"success": False, "message": "No devices connected"}
             
-            # Select device
-            if device_id:
-                self.device_id = device_id
-            elif len(devices) == 1:
+            if len(devices) == 1:
                 self.device_id = devices[0]["id"]
             else:
                 return {
@@ -131,24 +552,26 @@ class AndroidBridge:
                     "message": "Multiple devices found. Please specify device_id",
                     "devices": devices
                 }
-            
-            # Test connection
-            success, output = self._run_adb_command(["shell", "echo", "test"])
-            if success:
-                self.connected = True
-                config.android.device_id = self.device_id
-                config.save()
-                logger.info(f"Connected to device: {self.device_id}")
-                return {"success": True, "message": f"Connected to {self.device_id}", "device_id": self.device_id}
-            else:
-                return {"success": False, "message": f"Failed to connect: {output}"}
         
-        except Exception as e:
-            logger.error(f"Failed to connect device: {e}")
-            return {"success": False, "message": str(e)}
+        # Test connection
+        result = self._run_adb_command(["shell", "echo", "test"])
+        if result.ok:
+            self._reset_device_cache()
+            self.connected = True
+            # Reconnecting to the persisted device needs no config write
+            if config.android.device_id != self.device_id:
+                config.update("android", device_id=self.device_id)
+                config.save()
+            logger.info(f"Connected to device: {self.device_id}")
+            return {"success": True, "message": f"Connected to {self.device_id}", "device_id": self.device_id}
+        else:
+            return {"success": False, "message": f"Failed to connect: {result.out}"}
     
+    @_reports_errors
     def disconnect(self) -> Dict[str, Any]:
         """Disconnect from device"""
+        self._close_shell()
+        self._reset_device_cache()
         self.connected = False
         self.device_id = None
         logger.info("Disconnected from device")
@@ -156,62 +579,53 @@ class AndroidBridge:
     
     # ==================== DEVICE INFO ====================
     
-    def get_device_info(self) -> Dict[str, Any]:
+    def _reset_device_cache(self):
+        """Forget cached device properties"""
+        self._prop_cache = {}
+        self._screen_size = None
+        self._adb_keyboard = None
+        self._touch_device = None
+    
+    @_reports_errors
+    def get_device_info(self, refresh: bool = False) -> Dict[str, Any]:
         """Get device information"""
         if not self.connected:
             return {"success": False, "message": "No device connected"}
         
-        try:
-            info = {}
-            
-            # Model
-            success, output = self._run_adb_command(["shell", "getprop", "ro.product.model"])
-            if success:
-                info["model"] = output.strip()
-            
-            # Android version
-            success, output = self._run_adb_command(["shell", "getprop", "ro.build.version.release"])
-            if success:
-                info["android_version"] = output.strip()
-            
-            # Manufacturer
-            success, output = self._run_adb_command(["shell", "getprop", "ro.product.manufacturer"])
-            if success:
-                info["manufacturer"] = output.strip()
-            
-            # Serial
-            success, output = self._run_adb_command(["get-serialno"])
-            if success:
-                info["serial"] = output.strip()
-            
-            return {"success": True, "info": info}
+        if self._prop_cache and not refresh:
+            return {"success": True, "info": dict(self._prop_cache)}
         
-        except Exception as e:
-            logger.error(f"Failed to get device info: {e}")
-            return {"success": False, "message": str(e)}
+        # One shell round-trip for all properties; `---` separates the values
+        result = self._run_adb_command(["shell", _DEVICE_INFO_COMMAND])
+        if not result.ok:
+            return {"success": False, "message": result.out}
+        
+        return {"success": True, "info": self._store_device_info(result.out)}
     
+    def _store_device_info(self, output: str) -> Dict[str, str]:
+        """Parse the batched getprop output into the property cache"""
+        values = [value.strip() for value in output.split("---")]
+        self._prop_cache = dict(zip(_DEVICE_INFO_PROPS, values))
+        return dict(self._prop_cache)
+    
+    @_guarded("get_battery", RiskLevel.LOW)
     def get_battery_status(self) -> Dict[str, Any]:
         """Get battery status"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("get_battery", RiskLevel.LOW):
-            return {"success": False, "message": "Permission denied"}
-        
         try:
-            success, output = self._run_adb_command(["shell", "dumpsys", "battery"])
-            if not success:
-                return {"success": False, "message": output}
+            result = self._run_adb_command(["shell", "dumpsys", "battery"], binary=True)
+            if not result.ok:
+                return {"success": False, "message": result.out}
             
-            battery = {}
-            for line in output.split('\n'):
-                if 'level:' in line:
-                    battery["level"] = int(line.split(':')[1].strip())
-                elif 'status:' in line:
-                    battery["status"] = line.split(':')[1].strip()
-                elif 'temperature:' in line:
-                    temp = int(line.split(':')[1].strip())
-                    battery["temperature"] = f"{temp / 10}°C"
+            battery: Dict[str, Any] = {
+                key.decode(): value.decode("utf-8", "replace")
+                for key, value in _BATTERY_RE.findall(result.out)
+            }
+            if "level" in battery:
+                battery["level"] = int(battery["level"])
+            if "voltage" in battery:
+                battery["voltage"] = int(battery["voltage"])
+            if "temperature" in battery:
+                battery["temperature"] = f"{int(battery['temperature']) / 10}°C"
             
             return {"success": True, "battery": battery}
         
@@ -221,34 +635,44 @@ class AndroidBridge:
     
     # ==================== SCREEN CONTROL ====================
     
+    @staticmethod
+    def _default_screenshot_path() -> str:
+        """Timestamped screenshot path under the generated apps directory"""
+        from ..core.config import GENERATED_APPS_DIR
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return str(GENERATED_APPS_DIR / f"android_screen_{timestamp}.png")
+    
+    @_guarded("take_screenshot", RiskLevel.MEDIUM)
     def take_screenshot(self, save_path: Optional[str] = None) -> Dict[str, Any]:
         """Take screenshot of Android screen"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("take_screenshot", RiskLevel.MEDIUM):
-            return {"success": False, "message": "Permission denied"}
-        
         try:
             if save_path is None:
-                from ..core.config import GENERATED_APPS_DIR
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                save_path = str(GENERATED_APPS_DIR / f"android_screen_{timestamp}.png")
+                save_path = self._default_screenshot_path()
+            
+            if config.android.screenshot_exec_out:
+                # Stream the PNG straight over the ADB socket; no temp file on the device
+                result = self._exec_out("screencap -p")
+                if not result.ok or not result.out:
+                    return {"success": False, "message": "Failed to capture screenshot"}
+                
+                Path(save_path).write_bytes(result.out)
+                logger.info(f"Screenshot saved: {save_path}")
+                return {"success": True, "message": "Screenshot taken", "path": save_path}
             
             # Take screenshot on device
             device_path = f"/sdcard/screenshot_{int(time.time())}.png"
-            success, _ = self._run_adb_command(["shell", "screencap", "-p", device_path])
+            result = self._run_adb_command(["shell", "screencap", "-p", device_path])
             
-            if not success:
+            if not result.ok:
                 return {"success": False, "message": "Failed to capture screenshot"}
             
             # Pull screenshot to PC
-            success, _ = self._run_adb_command(["pull", device_path, save_path])
+            result = self._run_adb_command(["pull", device_path, save_path])
             
             # Delete from device
             self._run_adb_command(["shell", "rm", device_path])
             
-            if success:
+            if result.ok:
                 logger.info(f"Screenshot saved: {save_path}")
                 return {"success": True, "message": "Screenshot taken", "path": save_path}
             else:
@@ -258,253 +682,364 @@ class AndroidBridge:
             logger.error(f"Failed to take screenshot: {e}")
             return {"success": False, "message": str(e)}
     
-    def get_screen_size(self) -> Dict[str, Any]:
+    @_reports_errors
+    def get_screen_size(self, refresh: bool = False) -> Dict[str, Any]:
         """Get screen resolution"""
         if not self.connected:
             return {"success": False, "message": "No device connected"}
         
-        try:
-            success, output = self._run_adb_command(["shell", "wm", "size"])
-            if success:
-                match = re.search(r'(\d+)x(\d+)', output)
-                if match:
-                    return {
-                        "success": True,
-                        "width": int(match.group(1)),
-                        "height": int(match.group(2))
-                    }
-            
-            return {"success": False, "message": "Failed to get screen size"}
+        if self._screen_size is not None and not refresh:
+            width, height = self._screen_size
+            return {"success": True, "width": width, "height": height}
         
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        result = self._run_adb_command(["shell", "wm", "size"])
+        if result.ok:
+            sizes = _SIZE_RE.findall(result.out)
+            if sizes:
+                # The last size is the override when present, i.e. the active one
+                width, height = sizes[-1]
+                self._screen_size = (int(width), int(height))
+                return {
+                    "success": True,
+                    "width": self._screen_size[0],
+                    "height": self._screen_size[1]
+                }
+        
+        return {"success": False, "message": "Failed to get screen size"}
     
     # ==================== APP CONTROL ====================
     
+    @_guarded("open_app", RiskLevel.MEDIUM, lambda package_name: {"package": package_name})
     def open_app(self, package_name: str) -> Dict[str, Any]:
         """Open an app by package name"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
+        pkg = _COMMON_APPS.get(package_name.lower(), package_name)
         
-        if not self._check_permission("open_app", RiskLevel.MEDIUM, {"package": package_name}):
-            return {"success": False, "message": "Permission denied"}
-        
-        try:
-            # Common apps mapping
-            common_apps = {
-                "whatsapp": "com.whatsapp",
-                "telegram": "org.telegram.messenger",
-                "chrome": "com.android.chrome",
-                "youtube": "com.google.android.youtube",
-                "camera": "com.android.camera",
-                "settings": "com.android.settings",
-                "gallery": "com.google.android.apps.photos",
-                "maps": "com.google.android.apps.maps"
-            }
-            
-            pkg = common_apps.get(package_name.lower(), package_name)
-            
-            success, output = self._run_adb_command([
-                "shell", "monkey", "-p", pkg, "-c", 
-                "android.intent.category.LAUNCHER", "1"
-            ])
-            
-            if success:
-                logger.info(f"Opened app: {pkg}")
-                return {"success": True, "message": f"Opened {package_name}", "package": pkg}
-            else:
-                return {"success": False, "message": f"Failed to open app: {output}"}
+        result = self._run_adb_command([
+            "shell", "monkey", "-p", pkg, "-c", 
+            "android.intent.category.LAUNCHER", "1"
+        ])
         
-        except Exception as e:
-            logger.error(f"Failed to open app: {e}")
-            return {"success": False, "message": str(e)}
+        if result.ok:
+            logger.info(f"Opened app: {pkg}")
+            return {"success": True, "message": f"Opened {package_name}", "package": pkg}
+        else:
+            return {"success": False, "message": f"Failed to open app: {result.out}"}
     
+    @_guarded("close_app", RiskLevel.MEDIUM, lambda package_name: {"package": package_name})
     def close_app(self, package_name: str) -> Dict[str, Any]:
         """Close an app"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("close_app", RiskLevel.MEDIUM, {"package": package_name}):
-            return {"success": False, "message": "Permission denied"}
+        result = self._run_adb_command(["shell", "am", "force-stop", package_name])
         
-        try:
-            success, output = self._run_adb_command(["shell", "am", "force-stop", package_name])
-            
-            if success:
-                logger.info(f"Closed app: {package_name}")
-                return {"success": True, "message": f"Closed {package_name}"}
-            else:
-                return {"success": False, "message": output}
-        
-        except Exception as e:
-            logger.error(f"Failed to close app: {e}")
-            return {"success": False, "message": str(e)}
+        if result.ok:
+            logger.info(f"Closed app: {package_name}")
+            return {"success": True, "message": f"Closed {package_name}"}
+        else:
+            return {"success": False, "message": result.out}
     
+    @_reports_errors
     def list_installed_apps(self) -> Dict[str, Any]:
         """List installed apps"""
         if not self.connected:
             return {"success": False, "message": "No device connected"}
         
-        try:
-            success, output = self._run_adb_command(["shell", "pm", "list", "packages"])
-            
-            if not success:
-                return {"success": False, "message": output}
-            
-            apps = []
-            for line in output.split('\n'):
-                if line.startswith('package:'):
-                    apps.append(line.replace('package:', '').strip())
-            
-            return {"success": True, "apps": apps, "count": len(apps)}
+        result = self._run_adb_command(["shell", "pm", "list", "packages"], binary=True)
         
-        except Exception as e:
-            logger.error(f"Failed to list apps: {e}")
-            return {"success": False, "message": str(e)}
+        if not result.ok:
+            return {"success": False, "message": result.out}
+        
+        apps = [package.decode() for package in _PACKAGE_RE.findall(result.out)]
+        
+        return {"success": True, "apps": apps, "count": len(apps)}
     
     # ==================== INPUT CONTROL ====================
     
-    def tap(self, x: int, y: int) -> Dict[str, Any]:
-        """Tap at coordinates"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
+    def _probe_touch_device(self) -> Any:
+        """Find the touchscreen event node and its axis ranges"""
+        result = self._run_adb_command(["shell", "getevent", "-pl"])
+        if result.ok:
+            for block in result.out.split("add device")[1:]:
+                node = _INPUT_NODE_RE.search(block)
+                axes = dict(_TOUCH_AXIS_RE.findall(block))
+                if node and "X" in axes and "Y" in axes:
+                    return node.group(0), int(axes["X"]), int(axes["Y"])
+        return False
+    
+    def _touch_script(self, points: List[Tuple[int, int]], duration: int = 0) -> Optional[str]:
+        """
+        Build a sendevent script that replays a touch gesture through points
+        Returns None when direct touch input is disabled or unavailable
+        """
+        if not config.android.direct_touch_input:
+            return None
+        if self._touch_device is None:
+            self._touch_device = self._probe_touch_device()
+        if not self._touch_device:
+            return None
         
-        if not self._check_permission("tap", RiskLevel.MEDIUM, {"x": x, "y": y}):
-            return {"success": False, "message": "Permission denied"}
+        size = self.get_screen_size()
+        if not size["success"]:
+            return None
         
-        try:
-            success, output = self._run_adb_command(["shell", "input", "tap", str(x), str(y)])
-            
-            if success:
-                logger.info(f"Tapped at ({x}, {y})")
-                return {"success": True, "message": f"Tapped at ({x}, {y})"}
-            else:
-                return {"success": False, "message": output}
+        node, max_x, max_y = self._touch_device
+        scale_x = (max_x + 1) / size["width"]
+        scale_y = (max_y + 1) / size["height"]
         
-        except Exception as e:
-            logger.error(f"Failed to tap: {e}")
-            return {"success": False, "message": str(e)}
+        def event(ev_type: int, code: int, value: int) -> str:
+            return f"sendevent {node} {ev_type} {code} {value}"
+        
+        def position(x: int, y: int) -> List[str]:
+            return [
+                event(_EV_ABS, _ABS_MT_POSITION_X, int(x * scale_x)),
+                event(_EV_ABS, _ABS_MT_POSITION_Y, int(y * scale_y)),
+            ]
+        
+        pause = f"sleep {duration / 1000 / max(1, len(points) - 1):.3f}"
+        
+        commands = [event(_EV_ABS, _ABS_MT_TRACKING_ID, 0), *position(*points[0]),
+                    event(_EV_KEY, _BTN_TOUCH, 1), event(_EV_SYN, 0, 0)]
+        for x, y in points[1:]:
+            commands += [pause, *position(x, y), event(_EV_SYN, 0, 0)]
+        commands += [event(_EV_ABS, _ABS_MT_TRACKING_ID, -1),
+                     event(_EV_KEY, _BTN_TOUCH, 0), event(_EV_SYN, 0, 0)]
+        
+        return " && ".join(commands)
     
+    def _inject_touch(self, points: List[Tuple[int, int]], duration: int,
+                      fallback: List[str]) -> AdbResult:
+        """Send a touch gesture via sendevent, falling back to the `input` command"""
+        script = self._touch_script(points, duration)
+        if script:
+            result = self._run_adb_command(["shell", script])
+            if result.ok:
+                return result
+            # Event node not writable (unrooted, SELinux); stop trying on this device
+            logger.warning(f"Direct touch input failed, using input command: {result.out}")
+            self._touch_device = False
+        return self._run_adb_command(fallback)
+    
+    @_guarded("tap", RiskLevel.MEDIUM, lambda x, y: {"x": x, "y": y})
+    def tap(self, x: int, y: int) -> Dict[str, Any]:
+        """Tap at coordinates"""
+        result = self._inject_touch(
+            [(x, y)], 0, ["shell", "input", "tap", str(x), str(y)]
+        )
+        
+        if result.ok:
+            logger.info(f"Tapped at ({x}, {y})")
+            return {"success": True, "message": f"Tapped at ({x}, {y})"}
+        else:
+            return {"success": False, "message": result.out}
+    
+    @_guarded("swipe", RiskLevel.LOW)
     def swipe(self, x1: int, y1: int, x2: int, y2: int, duration: int = 300) -> Dict[str, Any]:
         """Swipe gesture"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("swipe", RiskLevel.LOW):
-            return {"success": False, "message": "Permission denied"}
+        steps = max(1, duration // 50)
+        points = [
+            (x1 + (x2 - x1) * i // steps, y1 + (y2 - y1) * i // steps)
+            for i in range(steps + 1)
+        ]
+        result = self._inject_touch(points, duration, [
+            "shell", "input", "swipe", 
+            str(x1), str(y1), str(x2), str(y2), str(duration)
+        ])
         
-        try:
-            success, output = self._run_adb_command([
-                "shell", "input", "swipe", 
-                str(x1), str(y1), str(x2), str(y2), str(duration)
-            ])
-            
-            if success:
-                return {"success": True, "message": "Swipe executed"}
-            else:
-                return {"success": False, "message": output}
-        
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        if result.ok:
+            return {"success": True, "message": "Swipe executed"}
+        else:
+            return {"success": False, "message": result.out}
     
+    @_guarded("type_text", RiskLevel.MEDIUM, lambda text: {"text": text[:50]})
     def type_text(self, text: str) -> Dict[str, Any]:
         """Type text on Android"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("type_text", RiskLevel.MEDIUM, {"text": text[:50]}):
-            return {"success": False, "message": "Permission denied"}
+        result = self._type_with_adb_keyboard(text) if self._has_adb_keyboard() else None
         
-        try:
+        if result is None or not result.ok:
             # Replace spaces with %s for ADB
             text_encoded = text.replace(' ', '%s')
-            success, output = self._run_adb_command(["shell", "input", "text", text_encoded])
-            
-            if success:
-                logger.info(f"Typed text: {text[:50]}...")
-                return {"success": True, "message": "Text entered"}
-            else:
-                return {"success": False, "message": output}
+            result = self._run_adb_command(["shell", "input", "text", text_encoded])
         
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        if result.ok:
+            logger.info(f"Typed text: {text[:50]}...")
+            return {"success": True, "message": "Text entered"}
+        else:
+            return {"success": False, "message": result.out}
     
-    def press_key(self, keycode: int) -> Dict[str, Any]:
-        """Press a key by keycode"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
+    def _has_adb_keyboard(self) -> bool:
+        """Whether ADBKeyboard is installed (checked once per device)"""
+        if self._adb_keyboard is None:
+            result = self._run_adb_command(["shell", "ime", "list", "-a", "-s"])
+            self._adb_keyboard = result.ok and _ADB_KEYBOARD_IME in result.out
+        return self._adb_keyboard
+    
+    def _type_with_adb_keyboard(self, text: str) -> Optional[AdbResult]:
+        """Type via an ADBKeyboard broadcast; None when it can't be used.
         
-        if not self._check_permission("press_key", RiskLevel.LOW, {"keycode": keycode}):
-            return {"success": False, "message": "Permission denied"}
+        If another keyboard is active, ADBKeyboard is selected only for this
+        broadcast and the user's keyboard is restored afterwards.
+        """
+        result = self._run_adb_command(["shell", "settings", "get", "secure", "default_input_method"])
+        previous = result.out.strip() if result.ok else ""
+        if not previous or previous == "null":
+            # Nothing we could restore; leave the keyboard alone
+            return None
         
+        switched = previous != _ADB_KEYBOARD_IME
         try:
-            success, output = self._run_adb_command(["shell", "input", "keyevent", str(keycode)])
-            
-            if success:
-                return {"success": True, "message": f"Pressed key {keycode}"}
-            else:
-                return {"success": False, "message": output}
+            if switched:
+                result = self._run_adb_command([
+                    "shell", "ime", "enable", _ADB_KEYBOARD_IME, "&&", "ime", "set", _ADB_KEYBOARD_IME
+                ])
+                if not result.ok:
+                    return None
+            msg = base64.b64encode(text.encode("utf-8")).decode("ascii")
+            return self._run_adb_command([
+                "shell", "am", "broadcast", "-a", "ADB_INPUT_B64", "--es", "msg", msg
+            ])
+        finally:
+            if switched:
+                self._run_adb_command(["shell", "ime", "set", previous])
+    
+    @_guarded("press_key", RiskLevel.LOW, lambda keycode: {"keycode": keycode})
+    def press_key(self, keycode: int) -> Dict[str, Any]:
+        """Press a key by keycode"""
+        result = self._run_adb_command(["shell", "input", "keyevent", str(keycode)])
         
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        if result.ok:
+            return {"success": True, "message": f"Pressed key {keycode}"}
+        else:
+            return {"success": False, "message": result.out}
     
     # Common key shortcuts
     def press_home(self) -> Dict[str, Any]:
         """Press home button"""
-        return self.press_key(3)
+        return self.press_key(_KEY_HOME)
     
     def press_back(self) -> Dict[str, Any]:
         """Press back button"""
-        return self.press_key(4)
+        return self.press_key(_KEY_BACK)
     
     def press_menu(self) -> Dict[str, Any]:
         """Press menu button"""
-        return self.press_key(82)
+        return self.press_key(_KEY_MENU)
     
     # ==================== DEVICE ACTIONS ====================
     
+    @_guarded("unlock_phone", RiskLevel.MEDIUM)
     def unlock_phone(self) -> Dict[str, Any]:
         """Unlock phone (swipe up)"""
-        if not self.connected:
-            return {"success": False, "message": "No device connected"}
-        
-        if not self._check_permission("unlock_phone", RiskLevel.MEDIUM):
+        # The script swipes itself, so it needs the same grant swipe() does
+        if not self._check_permission("swipe", RiskLevel.LOW):
             return {"success": False, "message": "Permission denied"}
         
-        try:
-            # Wake up
-            self._run_adb_command(["shell", "input", "keyevent", "26"])
-            time.sleep(0.5)
-            
-            # Swipe up to unlock
-            size_result = self.get_screen_size()
-            if size_result["success"]:
-                width = size_result["width"]
-                height = size_result["height"]
-                self.swipe(width//2, height-100, width//2, 100)
-                
-                logger.info("Phone unlocked")
-                return {"success": True, "message": "Phone unlocked"}
-            else:
-                return {"success": False, "message": "Failed to get screen size"}
+        # Wake, wait for the screen and swipe in a single shell round-trip
+        if self._screen_size is not None:
+            width, height = self._screen_size
+            swipe = f"input swipe {width//2} {height-100} {width//2} 100 300"
+        else:
+            swipe = f"{_SCREEN_SIZE_SCRIPT} && input swipe $((w/2)) $((h-100)) $((w/2)) 100 300"
         
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        result = self._run_adb_command([
+            "shell", f"input keyevent {_KEY_POWER}; {_WAIT_AWAKE_SCRIPT}; {swipe}"
+        ])
+        
+        if result.ok:
+            logger.info("Phone unlocked")
+            return {"success": True, "message": "Phone unlocked"}
+        else:
+            return {"success": False, "message": f"Failed to unlock phone: {result.out}"}
     
+    @_guarded("reboot", RiskLevel.CRITICAL, needs_connection=False)
     def reboot(self) -> Dict[str, Any]:
         """Reboot device"""
-        if not self._check_permission("reboot", RiskLevel.CRITICAL):
-            return {"success": False, "message": "Permission denied"}
+        result = self._run_adb_command(["reboot"])
+        if result.ok:
+            self._close_shell()
+            self.connected = False
+            return {"success": True, "message": "Device rebooting"}
+        else:
+            return {"success": False, "message": result.out}
+    
+    # ==================== ASYNC API ====================
+    
+    async def _run_adb_command_async(self, command: List[str], timeout: int = 30,
+                                     binary: bool = False) -> AdbResult:
+        """Execute ADB command without blocking the event loop"""
+        cmd = [self.adb_path]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.extend(command)
         
         try:
-            success, output = self._run_adb_command(["reboot"])
-            if success:
-                self.connected = False
-                return {"success": True, "message": "Device rebooting"}
-            else:
-                return {"success": False, "message": output}
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return AdbResult(False, "Command timed out", -1)
+        except OSError as e:
+            return AdbResult(False, str(e), -1)
+        
+        if proc.returncode == 0:
+            return AdbResult(True, stdout if binary else stdout.decode("utf-8", "replace"), 0)
+        return AdbResult(False, (stderr or stdout).decode("utf-8", "replace"), proc.returncode)
+    
+    @_reports_errors
+    async def get_device_info_async(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get device information; gather() over several bridges queries them in parallel"""
+        if not self.connected:
+            return {"success": False, "message": "No device connected"}
+        
+        if self._prop_cache and not refresh:
+            return {"success": True, "info": dict(self._prop_cache)}
+        
+        result = await self._run_adb_command_async(["shell", _DEVICE_INFO_COMMAND])
+        if not result.ok:
+            return {"success": False, "message": result.out}
+        return {"success": True, "info": self._store_device_info(result.out)}
+    
+    @_guarded("take_screenshot", RiskLevel.MEDIUM)
+    async def take_screenshot_async(self, save_path: Optional[str] = None) -> Dict[str, Any]:
+        """Take screenshot of Android screen without blocking the event loop"""
+        if save_path is None:
+            save_path = self._default_screenshot_path()
+        
+        if config.android.screenshot_exec_out:
+            result = await self._run_adb_command_async(["exec-out", "screencap", "-p"], binary=True)
+            if not result.ok or not result.out:
+                return {"success": False, "message": "Failed to capture screenshot"}
+            
+            try:
+                Path(save_path).write_bytes(result.out)
+            except OSError as e:
+                return {"success": False, "message": str(e)}
+        else:
+            # Same capture/pull/remove sequence as take_screenshot
+            device_path = f"/sdcard/screenshot_{int(time.time())}.png"
+            result = await self._run_adb_command_async(["shell", "screencap", "-p", device_path])
+            if not result.ok:
+                return {"success": False, "message": "Failed to capture screenshot"}
+            
+            result = await self._run_adb_command_async(["pull", device_path, save_path])
+            await self._run_adb_command_async(["shell", "rm", device_path])
+            if not result.ok:
+                return {"success": False, "message": "Failed to pull screenshot"}
+        
+        logger.info(f"Screenshot saved: {save_path}")
+        return {"success": True, "message": "Screenshot taken", "path": save_path}
+    
+    @_guarded("tap", RiskLevel.MEDIUM, lambda x, y: {"x": x, "y": y})
+    async def tap_async(self, x: int, y: int) -> Dict[str, Any]:
+        """Tap at coordinates without blocking the event loop"""
+        result = await self._run_adb_command_async(["shell", "input", "tap", str(x), str(y)])
+        if result.ok:
+            logger.info(f"Tapped at ({x}, {y})")
+            return {"success": True, "message": f"Tapped at ({x}, {y})"}
+        return {"success": False, "message": result.out}
 
 # Global instance
 android_bridge = AndroidBridge()
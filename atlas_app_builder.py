@@ -3,7 +3,10 @@ ShivAI Atlas - App Builder
 Generate GUI applications from templates
 """
 
+import functools
+import hashlib
 import os
+import re
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -13,104 +16,8 @@ from ..core.logger import get_logger
 
 logger = get_logger(__name__)
 
-class AppBuilder:
-    """Builds GUI applications from templates"""
-    
-    def __init__(self):
-        self.templates_dir = TEMPLATES_DIR / "app_templates"
-        self.templates_dir.mkdir(parents=True, exist_ok=True)
-        self.output_dir = GENERATED_APPS_DIR
-        self._init_templates()
-        logger.info("AppBuilder initialized")
-    
-    def _init_templates(self):
-        """Initialize app templates"""
-        templates = {
-            "todo": self._get_todo_template(),
-            "calculator": self._get_calculator_template(),
-            "notes": self._get_notes_template(),
-            "timer": self._get_timer_template()
-        }
-        
-        for name, code in templates.items():
-            template_file = self.templates_dir / f"{name}.py"
-            if not template_file.exists():
-                with open(template_file, 'w', encoding='utf-8') as f:
-                    f.write(code)
-    
-    def create_app(self, app_type: str, app_name: Optional[str] = None,
-                  custom_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Create a new app from template"""
-        try:
-            app_name = app_name or f"{app_type}_app"
-            custom_params = custom_params or {}
-            
-            # Get template code
-            template = self._get_template(app_type)
-            if not template:
-                return {
-                    "success": False,
-                    "message": f"Unknown app type: {app_type}"
-                }
-            
-            # Customize template
-            code = self._customize_template(template, app_name, custom_params)
-            
-            # Create app directory
-            app_dir = self.output_dir / app_name
-            app_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write main file
-            main_file = app_dir / "main.py"
-            with open(main_file, 'w', encoding='utf-8') as f:
-                f.write(code)
-            
-            # Create run script
-            run_script = app_dir / "run.bat"
-            with open(run_script, 'w') as f:
-                f.write(f"@echo off\npython main.py\npause")
-            
-            logger.info(f"Created app: {app_name} ({app_type})")
-            
-            return {
-                "success": True,
-                "message": f"App '{app_name}' created successfully",
-                "app_name": app_name,
-                "app_type": app_type,
-                "path": str(app_dir),
-                "main_file": str(main_file)
-            }
-        
-        except Exception as e:
-            logger.error(f"Failed to create app: {e}")
-            return {
-                "success": False,
-                "message": str(e)
-            }
-    
-    def _get_template(self, app_type: str) -> Optional[str]:
-        """Get template code for app type"""
-        templates = {
-            "todo": self._get_todo_template(),
-            "calculator": self._get_calculator_template(),
-            "notes": self._get_notes_template(),
-            "timer": self._get_timer_template()
-        }
-        return templates.get(app_type)
-    
-    def _customize_template(self, template: str, app_name: str, 
-                          params: Dict[str, Any]) -> str:
-        """Customize template with parameters"""
-        code = template.replace("{{APP_NAME}}", app_name)
-        
-        for key, value in params.items():
-            code = code.replace(f"{{{{{key}}}}}", str(value))
-        
-        return code
-    
-    def _get_todo_template(self) -> str:
-        """Todo app template"""
-        return '''
+# Todo app template
+_TODO_TEMPLATE = '''
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
@@ -204,10 +111,9 @@ if __name__ == "__main__":
     app = TodoApp(root)
     root.mainloop()
 '''
-    
-    def _get_calculator_template(self) -> str:
-        """Calculator app template"""
-        return '''
+
+# Calculator app template
+_CALCULATOR_TEMPLATE = '''
 import tkinter as tk
 from tkinter import ttk
 
@@ -277,10 +183,9 @@ if __name__ == "__main__":
     app = CalculatorApp(root)
     root.mainloop()
 '''
-    
-    def _get_notes_template(self) -> str:
-        """Notes app template"""
-        return '''
+
+# Notes app template
+_NOTES_TEMPLATE = '''
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
@@ -365,10 +270,9 @@ if __name__ == "__main__":
     app = NotesApp(root)
     root.mainloop()
 '''
-    
-    def _get_timer_template(self) -> str:
-        """Timer app template"""
-        return '''
+
+# Timer app template
+_TIMER_TEMPLATE = '''
 import tkinter as tk
 from tkinter import ttk
 
@@ -459,28 +363,145 @@ if __name__ == "__main__":
     app = TimerApp(root)
     root.mainloop()
 '''
+
+# {{KEY}} placeholders substituted by _customize_template
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Template source by app type, built once at import
+_TEMPLATES: Dict[str, str] = {
+    "todo": _TODO_TEMPLATE,
+    "calculator": _CALCULATOR_TEMPLATE,
+    "notes": _NOTES_TEMPLATE,
+    "timer": _TIMER_TEMPLATE
+}
+
+_TEMPLATE_NAMES = tuple(_TEMPLATES)
+
+# list_templates() response; shared between calls, so callers must not mutate it
+_LIST_TEMPLATES_RESPONSE = {
+    "success": True,
+    "templates": list(_TEMPLATE_NAMES),
+    "count": len(_TEMPLATE_NAMES)
+}
+
+# Failure response shape; copied with the message filled in
+_ERROR = {"success": False, "message": ""}
+
+# O_BINARY keeps Windows from translating newlines on the raw fd
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _write_file(path, *chunks: bytes) -> None:
+    """Write chunks to path, normally in a single writev() syscall"""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            written = os.writev(fd, chunks)
+        else:  # Windows has no writev
+            written = os.write(fd, b"".join(chunks))
+        # Regular files only write short on errors like a full disk; finish the rest
+        if written < sum(map(len, chunks)):
+            rest = memoryview(b"".join(chunks))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
+
+class AppBuilder:
+    """Builds GUI applications from templates"""
+    
+    # Launcher written next to each generated main.py
+    _RUN_BAT = b"@echo off\npython main.py\npause"
+    
+    def __init__(self):
+        self.templates_dir = TEMPLATES_DIR / "app_templates"
+        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = GENERATED_APPS_DIR
+        self._output_dir_str = str(self.output_dir)
+        self._init_templates()
+        logger.info("AppBuilder initialized")
+    
+    def _init_templates(self):
+        """Initialize app templates, rewriting only those whose source changed"""
+        existing = {entry.name for entry in os.scandir(self.templates_dir)}
+        for name, code in _TEMPLATES.items():
+            data = code.encode('utf-8')
+            digest = hashlib.blake2b(data).hexdigest()
+            sha_file = self.templates_dir / f"{name}.sha"
+            if (f"{name}.py" in existing and f"{name}.sha" in existing
+                    and sha_file.read_text(encoding='utf-8') == digest):
+                continue
+            (self.templates_dir / f"{name}.py").write_bytes(data)
+            sha_file.write_text(digest, encoding='utf-8')
+    
+    def create_app(self, app_type: str, app_name: Optional[str] = None,
+                  custom_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a new app from template"""
+        try:
+            app_name = app_name or f"{app_type}_app"
+            custom_params = custom_params or {}
+            
+            # Get template code
+            template = self._get_template(app_type)
+            if not template:
+                return {**_ERROR, "message": f"Unknown app type: {app_type}"}
+            
+            # Customize template
+            code = self._customize_template(template, app_name, custom_params)
+            
+            # Create app directory
+            app_dir = os.path.join(self._output_dir_str, app_name)
+            os.makedirs(app_dir, exist_ok=True)
+            
+            # Write main file
+            main_file = os.path.join(app_dir, "main.py")
+            _write_file(main_file, code.encode('utf-8'))
+            
+            # Create run script
+            _write_file(os.path.join(app_dir, "run.bat"), self._RUN_BAT)
+            
+            logger.info("Created app: %s (%s)", app_name, app_type)
+            
+            return {
+                "success": True,
+                "message": f"App '{app_name}' created successfully",
+                "app_name": app_name,
+                "app_type": app_type,
+                "path": app_dir,
+                "main_file": main_file
+            }
+        
+        except Exception as e:
+            logger.error("Failed to create app: %s", e)
+            return {**_ERROR, "message": str(e)}
+    
+    def _get_template(self, app_type: str) -> Optional[str]:
+        """Get template code for app type"""
+        return _TEMPLATES.get(app_type)
+    
+    def _customize_template(self, template: str, app_name: str, 
+                          params: Dict[str, Any]) -> str:
+        """Customize template with parameters"""
+        # One pass over the template; unknown placeholders are left untouched
+        subs = {key: str(value) for key, value in params.items()}
+        subs["APP_NAME"] = app_name
+        return _PLACEHOLDER_RE.sub(lambda m: subs.get(m.group(1), m.group(0)), template)
     
     def list_templates(self) -> Dict[str, Any]:
         """List available app templates"""
-        templates = ["todo", "calculator", "notes", "timer"]
-        return {
-            "success": True,
-            "templates": templates,
-            "count": len(templates)
-        }
+        return _LIST_TEMPLATES_RESPONSE
     
     def list_created_apps(self) -> Dict[str, Any]:
         """List all created apps"""
         try:
-            apps = []
-            if self.output_dir.exists():
-                for app_dir in self.output_dir.iterdir():
-                    if app_dir.is_dir():
-                        apps.append({
-                            "name": app_dir.name,
-                            "path": str(app_dir),
-                            "created": app_dir.stat().st_ctime
-                        })
+            try:
+                with os.scandir(self.output_dir) as it:
+                    apps = [{
+                        "name": entry.name,
+                        "path": entry.path,
+                        "created": entry.stat().st_ctime
+                    } for entry in it if entry.is_dir()]
+            except FileNotFoundError:
+                apps = []
             
             return {
                 "success": True,
@@ -488,10 +509,9 @@ if __name__ == "__main__":
                 "count": len(apps)
             }
         except Exception as e:
-            return {
-                "success": False,
-                "message": str(e)
-            }
+            return {**_ERROR, "message": str(e)}
 
-# Global instance
-app_builder = AppBuilder()
+@functools.cache
+def get_app_builder() -> AppBuilder:
+    """Shared AppBuilder, created on first use"""
+    return AppBuilder()
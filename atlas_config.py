@@ -4,12 +4,14 @@ Manages all system settings, paths, and environment variables
 """
 
 import os
-import json
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from enum import IntFlag
 import logging
 
+import orjson
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -18,27 +20,89 @@ TEMPLATES_DIR = DATA_DIR / "templates"
 LOGS_DIR = BASE_DIR / "logs"
 GENERATED_APPS_DIR = BASE_DIR / "generated_apps"
 
-# Ensure directories exist
-for directory in [DATA_DIR, DB_DIR, TEMPLATES_DIR, LOGS_DIR, GENERATED_APPS_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+def ensure_dirs():
+    """Ensure data, log and output directories exist"""
+    for directory in [DATA_DIR, DB_DIR, TEMPLATES_DIR, LOGS_DIR, GENERATED_APPS_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
+
+class Perm(IntFlag):
+    """Permission bits stored in PermissionsConfig.mask"""
+    FILES = 1
+    KEYBOARD_MOUSE = 2
+    SCREEN = 4
+    ANDROID = 8
+    ENTERCHAT = 16
+    NETWORK = 32
+    AI_REMOTE = 64
+    ASK_FILES = 128
+    ASK_KEYBOARD = 256
+    ASK_SCREEN = 512
+    ASK_ANDROID = 1024
+    ASK_ENTERCHAT = 2048
+
+# Named permission flags, as exposed on PermissionsConfig and in to_dict()
+_PERM_FLAGS = {
+    'can_access_files': Perm.FILES,
+    'can_control_keyboard_mouse': Perm.KEYBOARD_MOUSE,
+    'can_capture_screen': Perm.SCREEN,
+    'can_control_android': Perm.ANDROID,
+    'can_control_enterchat': Perm.ENTERCHAT,
+    'can_use_network': Perm.NETWORK,
+    'can_use_ai_remote': Perm.AI_REMOTE,
+    'ask_every_time_files': Perm.ASK_FILES,
+    'ask_every_time_keyboard': Perm.ASK_KEYBOARD,
+    'ask_every_time_screen': Perm.ASK_SCREEN,
+    'ask_every_time_android': Perm.ASK_ANDROID,
+    'ask_every_time_enterchat': Perm.ASK_ENTERCHAT,
+}
+
+def _flag_property(flag: Perm) -> property:
+    """Bool view of one bit of PermissionsConfig.mask"""
+    bit = int(flag)
+    
+    def getter(self) -> bool:
+        return bool(self.mask & bit)
+    
+    def setter(self, value: bool):
+        self.mask = self.mask | bit if value else self.mask & ~bit
+    
+    return property(getter, setter)
 
-@dataclass
+@dataclass(slots=True)
 class PermissionsConfig:
-    """User consent-based permissions"""
-    can_access_files: bool = False
-    can_control_keyboard_mouse: bool = False
-    can_capture_screen: bool = False
-    can_control_android: bool = False
-    can_control_enterchat: bool = False
-    can_use_network: bool = False
-    can_use_ai_remote: bool = False
-    ask_every_time_files: bool = True
-    ask_every_time_keyboard: bool = True
-    ask_every_time_screen: bool = True
-    ask_every_time_android: bool = True
-    ask_every_time_enterchat: bool = True
-
-@dataclass
+    """User consent-based permissions, packed into a Perm bitmask"""
+    mask: int = int(Perm.ASK_FILES | Perm.ASK_KEYBOARD | Perm.ASK_SCREEN
+                    | Perm.ASK_ANDROID | Perm.ASK_ENTERCHAT)
+    
+    can_access_files = _flag_property(Perm.FILES)
+    can_control_keyboard_mouse = _flag_property(Perm.KEYBOARD_MOUSE)
+    can_capture_screen = _flag_property(Perm.SCREEN)
+    can_control_android = _flag_property(Perm.ANDROID)
+    can_control_enterchat = _flag_property(Perm.ENTERCHAT)
+    can_use_network = _flag_property(Perm.NETWORK)
+    can_use_ai_remote = _flag_property(Perm.AI_REMOTE)
+    ask_every_time_files = _flag_property(Perm.ASK_FILES)
+    ask_every_time_keyboard = _flag_property(Perm.ASK_KEYBOARD)
+    ask_every_time_screen = _flag_property(Perm.ASK_SCREEN)
+    ask_every_time_android = _flag_property(Perm.ASK_ANDROID)
+    ask_every_time_enterchat = _flag_property(Perm.ASK_ENTERCHAT)
+    
+    def allows(self, required: Perm) -> bool:
+        """True if every bit in required is set"""
+        return self.mask & required == required
+    
+    @classmethod
+    def from_json(cls, value) -> "PermissionsConfig":
+        """Build from a saved mask, or the per-flag dict older versions wrote"""
+        if isinstance(value, int):
+            return cls(value)
+        perms = cls()
+        for name, enabled in value.items():
+            if name in _PERM_FLAGS:
+                setattr(perms, name, enabled)
+        return perms
+
+@dataclass(slots=True)
 class VoiceConfig:
     """Voice engine configuration"""
     enabled: bool = True
@@ -49,7 +113,7 @@ class VoiceConfig:
     use_offline_sr: bool = False
     vosk_model_path: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class EnterChatConfig:
     """EnterChat integration configuration"""
     enabled: bool = False
@@ -58,15 +122,18 @@ class EnterChatConfig:
     timeout: int = 30
     retry_attempts: int = 3
 
-@dataclass
+@dataclass(slots=True)
 class AndroidConfig:
     """Android ADB configuration"""
     enabled: bool = False
     adb_path: Optional[str] = None
     device_id: Optional[str] = None
     connection_timeout: int = 10
+    screenshot_exec_out: bool = True  # False: capture to /sdcard and pull (older adb)
+    direct_touch_input: bool = False  # sendevent to the touchscreen; natural orientation only
+    trust_all_permissions: bool = False  # skip permission checks (CI, sandboxed devices)
 
-@dataclass
+@dataclass(slots=True)
 class AIServiceConfig:
     """AI/LLM service configuration"""
     enabled: bool = False
@@ -76,12 +143,33 @@ class AIServiceConfig:
     max_tokens: int = 4000
     temperature: float = 0.7
 
+# Field names per section, computed once for serialization
+_PERM_FIELDS = tuple(_PERM_FLAGS)
+_VOICE_FIELDS = tuple(VoiceConfig.__dataclass_fields__)
+_ENTERCHAT_FIELDS = tuple(EnterChatConfig.__dataclass_fields__)
+_ANDROID_FIELDS = tuple(AndroidConfig.__dataclass_fields__)
+_AI_SERVICE_FIELDS = tuple(AIServiceConfig.__dataclass_fields__)
+
+def _shallow(section, names: tuple) -> Dict[str, Any]:
+    """Flat field dict for a config dataclass (all fields are primitives)"""
+    return {name: getattr(section, name) for name in names}
+
+# Dataclass-backed config sections: (attribute / JSON key, class)
+_SECTIONS = (
+    ('voice', VoiceConfig),
+    ('enterchat', EnterChatConfig),
+    ('android', AndroidConfig),
+    ('ai_service', AIServiceConfig),
+)
+
 class AtlasConfig:
     """Main configuration manager for ShivAI Atlas"""
     
     CONFIG_FILE = DATA_DIR / "config.json"
     
     def __init__(self):
+        ensure_dirs()
+        
         self.permissions = PermissionsConfig()
         self.voice = VoiceConfig()
         self.enterchat = EnterChatConfig()
@@ -100,6 +188,17 @@ class AtlasConfig:
         self.log_level = "INFO"
         self.log_file = LOGS_DIR / "atlas.log"
         
+        # Directories Atlas owns; low/medium-risk file actions inside them
+        # skip the permission_manager round trip
+        self.safe_paths: List[str] = [str(GENERATED_APPS_DIR)]
+        
+        # Bumped on every load/save/update so consumers can drop derived caches
+        self.revision = 0
+        
+        # to_dict() result, rebuilt only after the config changes
+        self._dirty = True
+        self._cached_dict: Optional[Dict[str, Any]] = None
+        
         # Load from file if exists
         self.load()
     
@@ -107,53 +206,47 @@ class AtlasConfig:
         """Load configuration from JSON file"""
         try:
             if self.CONFIG_FILE.exists():
-                with open(self.CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    # Load permissions
-                    if 'permissions' in data:
-                        self.permissions = PermissionsConfig(**data['permissions'])
-                    
-                    # Load voice config
-                    if 'voice' in data:
-                        self.voice = VoiceConfig(**data['voice'])
-                    
-                    # Load enterchat config
-                    if 'enterchat' in data:
-                        self.enterchat = EnterChatConfig(**data['enterchat'])
-                    
-                    # Load android config
-                    if 'android' in data:
-                        self.android = AndroidConfig(**data['android'])
-                    
-                    # Load AI service config
-                    if 'ai_service' in data:
-                        self.ai_service = AIServiceConfig(**data['ai_service'])
-                    
-                    # Load server settings
-                    if 'server' in data:
-                        self.server_host = data['server'].get('host', self.server_host)
-                        self.server_port = data['server'].get('port', self.server_port)
-                        self.debug_mode = data['server'].get('debug', self.debug_mode)
-                    
-                    # Load logging settings
-                    if 'logging' in data:
-                        self.log_level = data['logging'].get('level', self.log_level)
+                data = orjson.loads(self.CONFIG_FILE.read_bytes())
+                
+                # Load permissions
+                if 'permissions' in data:
+                    self.permissions = PermissionsConfig.from_json(data['permissions'])
+                
+                # Load dataclass sections, ignoring keys this version doesn't know
+                for name, cls in _SECTIONS:
+                    if name in data:
+                        known = cls.__dataclass_fields__
+                        setattr(self, name, cls(**{k: v for k, v in data[name].items() if k in known}))
+                
+                # Load server settings
+                srv = {'host': self.server_host, 'port': self.server_port, 'debug': self.debug_mode}
+                srv.update(data.get('server', {}))
+                self.server_host, self.server_port, self.debug_mode = srv['host'], srv['port'], srv['debug']
+                
+                # Load logging settings
+                log = {'level': self.log_level}
+                log.update(data.get('logging', {}))
+                self.log_level = log['level']
                 
+                # Load file settings
+                self.safe_paths = list(data.get('files', {}).get('safe_paths', self.safe_paths))
+                
+                self._dirty = True
+                self.revision += 1
                 return True
         except Exception as e:
-            logging.error(f"Failed to load config: {e}")
+            logging.error("Failed to load config: %s", e)
         return False
     
     def save(self) -> bool:
         """Save configuration to JSON file"""
         try:
             data = {
-                'permissions': asdict(self.permissions),
-                'voice': asdict(self.voice),
-                'enterchat': asdict(self.enterchat),
-                'android': asdict(self.android),
-                'ai_service': asdict(self.ai_service),
+                'permissions': self.permissions.mask,
+                'voice': _shallow(self.voice, _VOICE_FIELDS),
+                'enterchat': _shallow(self.enterchat, _ENTERCHAT_FIELDS),
+                'android': _shallow(self.android, _ANDROID_FIELDS),
+                'ai_service': _shallow(self.ai_service, _AI_SERVICE_FIELDS),
                 'server': {
                     'host': self.server_host,
                     'port': self.server_port,
@@ -161,30 +254,58 @@ class AtlasConfig:
                 },
                 'logging': {
                     'level': self.log_level
+                },
+                'files': {
+                    'safe_paths': self.safe_paths
                 }
             }
             
-            with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            # Write a sibling temp file and swap it in so a crash never leaves
+            # a truncated config.json behind
+            tmp = self.CONFIG_FILE.with_suffix(".json.tmp")
+            tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp, self.CONFIG_FILE)
             return True
         except Exception as e:
-            logging.error(f"Failed to save config: {e}")
+            logging.error("Failed to save config: %s", e)
             return False
+        finally:
+            # Callers may have changed fields directly before saving; they are
+            # live whether or not the write succeeded
+            self._dirty = True
+            self.revision += 1
+    
+    def update(self, section: str, **values) -> None:
+        """Set fields on a config section and invalidate the to_dict() cache"""
+        target = getattr(self, section)
+        for key, value in values.items():
+            setattr(target, key, value)
+        self._dirty = True
+        self.revision += 1
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert config to dictionary"""
-        return {
-            'permissions': asdict(self.permissions),
-            'voice': asdict(self.voice),
-            'enterchat': asdict(self.enterchat),
-            'android': asdict(self.android),
-            'ai_service': asdict(self.ai_service),
+        """Convert config to dictionary.
+        
+        The result is cached until the next load(), save() or update() and
+        shared between callers, so treat it as read-only.
+        """
+        if not self._dirty and self._cached_dict is not None:
+            return self._cached_dict
+        
+        self._cached_dict = {
+            'permissions': _shallow(self.permissions, _PERM_FIELDS),
+            'voice': _shallow(self.voice, _VOICE_FIELDS),
+            'enterchat': _shallow(self.enterchat, _ENTERCHAT_FIELDS),
+            'android': _shallow(self.android, _ANDROID_FIELDS),
+            'ai_service': _shallow(self.ai_service, _AI_SERVICE_FIELDS),
             'server': {
                 'host': self.server_host,
                 'port': self.server_port,
                 'debug': self.debug_mode
             },
+            'files': {
+                'safe_paths': list(self.safe_paths)
+            },
             'paths': {
                 'base': str(BASE_DIR),
                 'data': str(DATA_DIR),
@@ -194,6 +315,8 @@ class AtlasConfig:
                 'generated_apps': str(GENERATED_APPS_DIR)
             }
         }
+        self._dirty = False
+        return self._cached_dict
 
 # Global config instance
 config = AtlasConfig()
@@ -3,18 +3,60 @@ ShivAI Atlas - EnterChat Connector
 Integration with EnterChat vX messaging super-client
 """
 
+import asyncio
+import atexit
+import aiohttp
+import ijson
+import orjson
 import requests
-import json
-from typing import Dict, Any, List, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import logging
 
 from ..core.config import config
+from ..core.http import get_session, POOL_MAXSIZE
 from ..core.logger import get_logger
 from ..core.permissions import permission_manager, PermissionType, RiskLevel
 
 logger = get_logger(__name__)
 
+# Retry backoff: exponential from 0.1s, capped at 5s, jittered +/-50%
+_BACKOFF_BASE = 0.1
+_BACKOFF_CAP = 5.0
+
+# _make_request errors meaning the server lacks an endpoint
+_UNSUPPORTED_STATUS = ("HTTP 404:", "HTTP 405:")
+
+# Seconds a cached conversation list is served before a background refresh
+_CONV_CACHE_TTL = 60.0
+
+# send_by_name "not found" wording per app: (what is looked up, app display name)
+_NAME_LABELS = {
+    "whatsapp": ("Contact", "WhatsApp"),
+    "telegram": ("Chat", "Telegram"),
+}
+
+# Bytes of an error response body kept for the error message
+_ERROR_BODY_LIMIT = 512
+
+def _body_preview(content: bytes) -> str:
+    """Decode a (possibly truncated) error body for messages"""
+    return content.decode("utf-8", "replace")
+
+def _backoff_delay(retry: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt"""
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form; use our own backoff
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** retry) * random.uniform(0.5, 1.5)
+
 class EnterChatConnector:
     """EnterChat messaging integration"""
     
@@ -24,6 +66,26 @@ class EnterChatConnector:
         self.timeout = config.enterchat.timeout
         self.retry_attempts = config.enterchat.retry_attempts
         self.connected = False
+        
+        # Pooled keep-alive connections, shared with other connectors; our
+        # headers go on each request rather than on the session
+        self.session = get_session()
+        self._headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+        
+        # None until the first bulk_send tells us whether /api/messages/send_bulk exists
+        self._bulk_endpoint_supported: Optional[bool] = None
+        
+        # app_id -> (expires_at, conversations, lowercase name -> id)
+        self._conv_cache: Dict[str, tuple] = {}
+        self._conv_refreshing: set = set()
+        
+        # aiohttp session for the *_async methods, bound to the loop that created it
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        atexit.register(self._close_async_session_at_exit)
+        
         logger.info("EnterChatConnector initialized")
     
     def _check_permission(self, action: str, risk_level: RiskLevel, params: dict = None) -> bool:
@@ -32,54 +94,139 @@ class EnterChatConnector:
             logger.warning("EnterChat is disabled in settings")
             return False
         
-        granted, reason = permission_manager.check_permission(
-            PermissionType.ENTERCHAT, action, risk_level, params or {}
+        # A grant covers one app and conversation (send_by_name targets a name)
+        params = params or {}
+        scope = (params.get("app"), params.get("conversation", params.get("name")))
+        granted, reason = permission_manager.check_permission_cached(
+            PermissionType.ENTERCHAT, action, risk_level, params, scope=scope
         )
         if not granted:
             logger.warning(f"Permission denied for {action}: {reason}")
         return granted
     
-    def _make_request(self, method: str, endpoint: str, data: dict = None, 
-                     retry: int = 0) -> tuple[bool, Any]:
-        """Make HTTP request to EnterChat API"""
-        try:
-            url = f"{self.base_url}{endpoint}"
-            headers = {
-                "Content-Type": "application/json"
-            }
+    def _make_request(self, method: str, endpoint: str, data: dict = None,
+                     params: dict = None) -> tuple[bool, Any]:
+        """Make HTTP request to EnterChat API, retrying on 429 and timeouts"""
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            return False, "Invalid HTTP method"
+        
+        url = f"{self.base_url}{endpoint}"
+        # Serialized once, reused across retries
+        body = orjson.dumps(data) if data is not None and method in ("POST", "PUT") else None
+        
+        for retry in range(self.retry_attempts + 1):
+            try:
+                # Streamed so error bodies are only read up to _ERROR_BODY_LIMIT;
+                # the with block hands the connection back to the pool
+                with self.session.request(method, url, data=body, params=params,
+                                          headers=self._headers, timeout=self.timeout,
+                                          stream=True) as response:
+                    status = response.status_code
+                    if status in [200, 201]:
+                        content = response.content
+                        return True, orjson.loads(content) if content else {}
+                    
+                    preview = _body_preview(response.raw.read(_ERROR_BODY_LIMIT, decode_content=True))
+                    if status != 429 or retry == self.retry_attempts:
+                        return False, f"HTTP {status}: {preview}"
+                    # Rate limited, retry
+                    delay = _backoff_delay(retry, response.headers.get("Retry-After"))
             
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
+            except requests.exceptions.Timeout:
+                if retry == self.retry_attempts:
+                    return False, "Request timed out"
+                delay = _backoff_delay(retry)
             
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=self.timeout)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data, timeout=self.timeout)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=self.timeout)
-            else:
-                return False, "Invalid HTTP method"
+            except Exception as e:
+                logger.error(f"EnterChat API request failed: {e}")
+                return False, str(e)
             
-            if response.status_code in [200, 201]:
-                return True, response.json() if response.text else {}
-            elif response.status_code == 429 and retry < self.retry_attempts:
-                # Rate limited, retry
-                import time
-                time.sleep(2 ** retry)
-                return self._make_request(method, endpoint, data, retry + 1)
+            time.sleep(delay)
+    
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        """Get the aiohttp session for the running loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            # Swap in the new session before awaiting anything so concurrent
+            # callers on this loop share it
+            stale, stale_loop = self._async_session, self._async_loop
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._async_loop = loop
+            if stale is not None:
+                await self._close_session(stale, stale_loop)
+        return self._async_session
+    
+    @staticmethod
+    async def _close_session(session: aiohttp.ClientSession,
+                             loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session, on its own loop if that loop is still running elsewhere"""
+        if session.closed:
+            return
+        try:
+            if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
             else:
-                return False, f"HTTP {response.status_code}: {response.text}"
-        
-        except requests.exceptions.Timeout:
-            if retry < self.retry_attempts:
-                return self._make_request(method, endpoint, data, retry + 1)
-            return False, "Request timed out"
-        
+                await session.close()
+        except Exception as e:
+            logger.debug(f"Failed to close stale aiohttp session: {e}")
+    
+    async def aclose(self):
+        """Close the aiohttp session"""
+        session, loop = self._async_session, self._async_loop
+        self._async_session = self._async_loop = None
+        if session is not None:
+            await self._close_session(session, loop)
+    
+    def _close_async_session_at_exit(self):
+        """atexit hook: close a session nobody closed with aclose()"""
+        session, loop = self._async_session, self._async_loop
+        self._async_session = self._async_loop = None
+        if session is None or session.closed:
+            return
+        try:
+            if loop is not None and loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+            else:
+                asyncio.run(session.close())
         except Exception as e:
-            logger.error(f"EnterChat API request failed: {e}")
-            return False, str(e)
+            logger.debug(f"Failed to close aiohttp session at exit: {e}")
+    
+    async def _make_request_async(self, method: str, endpoint: str, data: dict = None,
+                                  params: dict = None) -> tuple[bool, Any]:
+        """Async variant of _make_request"""
+        url = f"{self.base_url}{endpoint}"
+        body = orjson.dumps(data) if data is not None and method in ("POST", "PUT") else None
+        
+        for retry in range(self.retry_attempts + 1):
+            try:
+                session = await self._get_async_session()
+                async with session.request(method, url, data=body, params=params) as response:
+                    status = response.status
+                    if status in [200, 201]:
+                        content = await response.read()
+                        return True, orjson.loads(content) if content else {}
+                    preview = _body_preview(await response.content.read(_ERROR_BODY_LIMIT))
+                    retry_after = response.headers.get("Retry-After")
+                
+                if status != 429 or retry == self.retry_attempts:
+                    return False, f"HTTP {status}: {preview}"
+                # Rate limited, retry
+                delay = _backoff_delay(retry, retry_after)
+            
+            except asyncio.TimeoutError:
+                if retry == self.retry_attempts:
+                    return False, "Request timed out"
+                delay = _backoff_delay(retry)
+            
+            except Exception as e:
+                logger.error(f"EnterChat API request failed: {e}")
+                return False, str(e)
+            
+            await asyncio.sleep(delay)
     
     # ==================== CONNECTION ====================
     
@@ -166,81 +313,81 @@ class EnterChatConnector:
             logger.error(f"Failed to send message: {e}")
             return {"success": False, "message": str(e)}
     
-    def send_whatsapp_message(self, contact_name: str, message: str) -> Dict[str, Any]:
-        """Send WhatsApp message by contact name"""
-        if not self._check_permission("send_whatsapp", RiskLevel.MEDIUM, {
-            "contact": contact_name,
-            "message": message[:100]
+    async def send_message_async(self, app_id: str, conversation_id: str, text: str,
+                                 attachments: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async variant of send_message"""
+        if not self._check_permission("send_message", RiskLevel.MEDIUM, {
+            "app": app_id,
+            "conversation": conversation_id,
+            "text": text[:100]
         }):
             return {"success": False, "message": "Permission denied"}
         
-        try:
-            # First, find the conversation
-            conversations = self.list_conversations("whatsapp")
-            if not conversations["success"]:
-                return conversations
-            
-            # Search for contact
-            conversation_id = None
-            for conv in conversations.get("conversations", []):
-                if contact_name.lower() in conv.get("name", "").lower():
-                    conversation_id = conv.get("id")
-                    break
-            
-            if not conversation_id:
-                return {
-                    "success": False,
-                    "message": f"Contact '{contact_name}' not found in WhatsApp"
-                }
-            
-            # Send message
-            return self.send_message("whatsapp", conversation_id, message)
+        data = {
+            "app_id": app_id,
+            "conversation_id": conversation_id,
+            "text": text,
+            "attachments": attachments or []
+        }
         
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        success, result = await self._make_request_async("POST", "/api/messages/send", data)
+        
+        if success:
+            logger.info(f"Message sent via {app_id} to {conversation_id}")
+            return {
+                "success": True,
+                "message": "Message sent",
+                "message_id": result.get("message_id")
+            }
+        return {"success": False, "message": result}
     
-    def send_telegram_message(self, chat_name: str, message: str) -> Dict[str, Any]:
-        """Send Telegram message by chat name"""
-        if not self._check_permission("send_telegram", RiskLevel.MEDIUM, {
-            "chat": chat_name,
+    def send_by_name(self, app_id: str, name: str, message: str, *,
+                     risk_action: str = "send_message") -> Dict[str, Any]:
+        """Send a message to the conversation whose name matches `name`"""
+        if not self._check_permission(risk_action, RiskLevel.MEDIUM, {
+            "app": app_id,
+            "name": name,
             "message": message[:100]
         }):
             return {"success": False, "message": "Permission denied"}
         
         try:
-            conversations = self.list_conversations("telegram")
-            if not conversations["success"]:
-                return conversations
-            
-            conversation_id = None
-            for conv in conversations.get("conversations", []):
-                if chat_name.lower() in conv.get("name", "").lower():
-                    conversation_id = conv.get("id")
-                    break
+            conversation_id, error = self._find_conversation_id(app_id, name)
+            if error:
+                return error
             
             if not conversation_id:
+                kind, app_label = _NAME_LABELS.get(app_id, ("Conversation", app_id))
                 return {
                     "success": False,
-                    "message": f"Chat '{chat_name}' not found in Telegram"
+                    "message": f"{kind} '{name}' not found in {app_label}"
                 }
             
-            return self.send_message("telegram", conversation_id, message)
+            return self.send_message(app_id, conversation_id, message)
         
         except Exception as e:
             return {"success": False, "message": str(e)}
     
+    def send_whatsapp_message(self, contact_name: str, message: str) -> Dict[str, Any]:
+        """Send WhatsApp message by contact name"""
+        return self.send_by_name("whatsapp", contact_name, message, risk_action="send_whatsapp")
+    
+    def send_telegram_message(self, chat_name: str, message: str) -> Dict[str, Any]:
+        """Send Telegram message by chat name"""
+        return self.send_by_name("telegram", chat_name, message, risk_action="send_telegram")
+    
     # ==================== CONVERSATIONS ====================
     
     def list_conversations(self, app_id: str, limit: int = 50) -> Dict[str, Any]:
         """List conversations for a specific app"""
         try:
             success, result = self._make_request(
-                "GET", 
-                f"/api/conversations?app_id={app_id}&limit={limit}"
+                "GET", "/api/conversations", params={"app_id": app_id, "limit": limit}
             )
             
             if success:
                 conversations = result.get("conversations", [])
+                self._store_conversations(app_id, conversations)
                 return {
                     "success": True,
                     "conversations": conversations,
@@ -252,54 +399,140 @@ class EnterChatConnector:
         except Exception as e:
             return {"success": False, "message": str(e)}
     
-    def get_unified_inbox(self, limit: int = 100) -> Dict[str, Any]:
-        """Get unified inbox from all apps"""
-        if not self._check_permission("get_inbox", RiskLevel.LOW):
-            return {"success": False, "message": "Permission denied"}
+    def _store_conversations(self, app_id: str, conversations: List[dict]):
+        """Cache conversations with a lowercase name -> id index (first match wins)"""
+        index = {}
+        for conv in conversations:
+            index.setdefault(conv.get("name", "").lower(), conv.get("id"))
+        self._conv_cache[app_id] = (time.monotonic() + _CONV_CACHE_TTL, conversations, index)
+    
+    def _cached_conversations(self, app_id: str) -> tuple[Optional[tuple], Optional[Dict[str, Any]]]:
+        """Return (cache entry, None), or (None, error result) if a cold fetch fails.
+        
+        Expired entries are still served while a background thread refreshes them.
+        """
+        entry = self._conv_cache.get(app_id)
+        if entry is None:
+            result = self.list_conversations(app_id)
+            if not result["success"]:
+                return None, result
+            return self._conv_cache[app_id], None
+        
+        if entry[0] < time.monotonic() and app_id not in self._conv_refreshing:
+            self._conv_refreshing.add(app_id)
+            threading.Thread(target=self._refresh_conversations, args=(app_id,), daemon=True).start()
+        return entry, None
+    
+    def _find_conversation_id(self, app_id: str, name: str) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Resolve a contact/chat name to a conversation id: exact match, then substring.
+        
+        A name missing from a cached list triggers one fresh fetch, so new
+        conversations don't wait out the cache TTL.
+        """
+        name_lower = name.lower()
+        fetched = app_id not in self._conv_cache
         
+        while True:
+            entry, error = self._cached_conversations(app_id)
+            if entry is None:
+                return None, error
+            
+            index = entry[2]
+            conversation_id = index.get(name_lower)
+            if conversation_id:
+                return conversation_id, None
+            for conv_name, conv_id in index.items():
+                if name_lower in conv_name:
+                    return conv_id, None
+            
+            if fetched:
+                return None, None
+            fetched = True
+            self._conv_cache.pop(app_id, None)
+    
+    def _refresh_conversations(self, app_id: str):
+        """Background refresh for _cached_conversations"""
         try:
-            success, result = self._make_request(
-                "GET", 
-                f"/api/inbox/unified?limit={limit}"
-            )
+            self.list_conversations(app_id)
+        finally:
+            self._conv_refreshing.discard(app_id)
+    
+    def _iter_items(self, endpoint: str, params: dict, prefix: str) -> Iterator[Any]:
+        """Stream items of a JSON array out of a GET response without buffering the body.
+        
+        Raises requests exceptions on HTTP errors, after the same 429/timeout
+        retries as _make_request.
+        """
+        url = f"{self.base_url}{endpoint}"
+        for retry in range(self.retry_attempts + 1):
+            try:
+                response = self.session.get(url, params=params, headers=self._headers,
+                                            timeout=self.timeout, stream=True)
+            except requests.exceptions.Timeout:
+                if retry == self.retry_attempts:
+                    raise requests.exceptions.Timeout("Request timed out")
+                time.sleep(_backoff_delay(retry))
+                continue
             
-            if success:
-                messages = result.get("messages", [])
-                return {
-                    "success": True,
-                    "messages": messages,
-                    "count": len(messages)
-                }
-            else:
-                return {"success": False, "message": result}
+            if response.status_code != 429 or retry == self.retry_attempts:
+                break
+            # Rate limited, retry
+            delay = _backoff_delay(retry, response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(delay)
+        
+        with response:
+            if response.status_code not in [200, 201]:
+                preview = _body_preview(response.raw.read(_ERROR_BODY_LIMIT, decode_content=True))
+                raise requests.HTTPError(f"HTTP {response.status_code}: {preview}")
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, prefix, use_float=True)
+    
+    def iter_unified_inbox(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream unified inbox messages; raises PermissionError if not permitted"""
+        if not self._check_permission("get_inbox", RiskLevel.LOW):
+            raise PermissionError("Permission denied")
+        
+        yield from self._iter_items("/api/inbox/unified", {"limit": limit}, "messages.item")
+    
+    def get_unified_inbox(self, limit: int = 100) -> Dict[str, Any]:
+        """Get unified inbox from all apps"""
+        try:
+            messages = list(self.iter_unified_inbox(limit))
+            return {
+                "success": True,
+                "messages": messages,
+                "count": len(messages)
+            }
         
         except Exception as e:
             return {"success": False, "message": str(e)}
     
-    def get_conversation_messages(self, app_id: str, conversation_id: str, 
-                                  limit: int = 50) -> Dict[str, Any]:
-        """Get messages from a specific conversation"""
+    def iter_conversation_messages(self, app_id: str, conversation_id: str,
+                                   limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """Stream messages from a conversation; raises PermissionError if not permitted"""
         if not self._check_permission("get_messages", RiskLevel.LOW, {
             "app": app_id,
             "conversation": conversation_id
         }):
-            return {"success": False, "message": "Permission denied"}
+            raise PermissionError("Permission denied")
         
+        yield from self._iter_items(
+            "/api/messages",
+            {"app_id": app_id, "conversation_id": conversation_id, "limit": limit},
+            "messages.item"
+        )
+    
+    def get_conversation_messages(self, app_id: str, conversation_id: str, 
+                                  limit: int = 50) -> Dict[str, Any]:
+        """Get messages from a specific conversation"""
         try:
-            success, result = self._make_request(
-                "GET",
-                f"/api/messages?app_id={app_id}&conversation_id={conversation_id}&limit={limit}"
-            )
-            
-            if success:
-                messages = result.get("messages", [])
-                return {
-                    "success": True,
-                    "messages": messages,
-                    "count": len(messages)
-                }
-            else:
-                return {"success": False, "message": result}
+            messages = list(self.iter_conversation_messages(app_id, conversation_id, limit))
+            return {
+                "success": True,
+                "messages": messages,
+                "count": len(messages)
+            }
         
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -309,11 +542,11 @@ class EnterChatConnector:
     def search_messages(self, query: str, app_id: Optional[str] = None) -> Dict[str, Any]:
         """Search messages across apps"""
         try:
-            params = f"?query={query}"
+            params = {"query": query}
             if app_id:
-                params += f"&app_id={app_id}"
+                params["app_id"] = app_id
             
-            success, result = self._make_request("GET", f"/api/search{params}")
+            success, result = self._make_request("GET", "/api/search", params=params)
             
             if success:
                 results = result.get("results", [])
@@ -331,11 +564,9 @@ class EnterChatConnector:
     def get_unread_count(self, app_id: Optional[str] = None) -> Dict[str, Any]:
         """Get unread message count"""
         try:
-            endpoint = "/api/unread"
-            if app_id:
-                endpoint += f"?app_id={app_id}"
+            params = {"app_id": app_id} if app_id else None
             
-            success, result = self._make_request("GET", endpoint)
+            success, result = self._make_request("GET", "/api/unread", params=params)
             
             if success:
                 return {
@@ -376,18 +607,11 @@ class EnterChatConnector:
                               last_n_messages: int = 50) -> Dict[str, Any]:
         """Get last N messages for summarization"""
         try:
-            messages_result = self.get_conversation_messages(
-                app_id, conversation_id, last_n_messages
-            )
-            
-            if not messages_result["success"]:
-                return messages_result
-            
-            messages = messages_result.get("messages", [])
+            messages = self.iter_conversation_messages(app_id, conversation_id, last_n_messages)
             
-            # Format messages for summarization
+            # Format messages for summarization, stopping once we have enough
             formatted = []
-            for msg in messages:
+            for msg in islice(messages, last_n_messages):
                 formatted.append({
                     "sender": msg.get("sender", "Unknown"),
                     "text": msg.get("text", ""),
@@ -406,8 +630,8 @@ class EnterChatConnector:
             return {"success": False, "message": str(e)}
     
     def bulk_send(self, app_id: str, recipient_ids: List[str], 
-                 message: str) -> Dict[str, Any]:
-        """Send message to multiple recipients"""
+                 message: str, max_concurrency: int = 16) -> Dict[str, Any]:
+        """Send message to multiple recipients, up to max_concurrency at a time"""
         if not self._check_permission("bulk_send", RiskLevel.HIGH, {
             "app": app_id,
             "recipients": len(recipient_ids),
@@ -416,33 +640,77 @@ class EnterChatConnector:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            results = []
-            successful = 0
-            failed = 0
-            
-            for recipient_id in recipient_ids:
-                result = self.send_message(app_id, recipient_id, message)
-                results.append({
-                    "recipient_id": recipient_id,
-                    "success": result["success"]
+            # One request for the whole batch when the server supports it
+            if self._bulk_endpoint_supported is not False:
+                success, result = self._make_request("POST", "/api/messages/send_bulk", {
+                    "app_id": app_id,
+                    "recipients": recipient_ids,
+                    "text": message
                 })
-                
-                if result["success"]:
-                    successful += 1
-                else:
-                    failed += 1
+                if success:
+                    self._bulk_endpoint_supported = True
+                    results = [
+                        {"recipient_id": r.get("recipient_id"), "success": bool(r.get("success"))}
+                        for r in result.get("results", [])
+                    ]
+                    return self._bulk_summary(results, len(recipient_ids))
+                if not result.startswith(_UNSUPPORTED_STATUS):
+                    return {"success": False, "message": result}
+                # Older server without send_bulk; use per-recipient sends from now on
+                self._bulk_endpoint_supported = False
             
-            logger.info(f"Bulk send completed: {successful} successful, {failed} failed")
-            return {
-                "success": True,
-                "message": f"Sent to {successful}/{len(recipient_ids)} recipients",
-                "successful": successful,
-                "failed": failed,
-                "results": results
-            }
+            # Sends share the session's connection pool, so cap workers at its size
+            workers = max(1, min(max_concurrency, POOL_MAXSIZE, len(recipient_ids)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sends = list(executor.map(
+                    lambda recipient_id: self.send_message(app_id, recipient_id, message),
+                    recipient_ids
+                ))
+            
+            results = [
+                {"recipient_id": recipient_id, "success": result["success"]}
+                for recipient_id, result in zip(recipient_ids, sends)
+            ]
+            return self._bulk_summary(results, len(recipient_ids))
         
         except Exception as e:
             return {"success": False, "message": str(e)}
+    
+    def _bulk_summary(self, results: List[Dict[str, Any]], total: int) -> Dict[str, Any]:
+        """Build the bulk send response from per-recipient results"""
+        successful = sum(1 for r in results if r["success"])
+        failed = len(results) - successful
+        
+        logger.info(f"Bulk send completed: {successful} successful, {failed} failed")
+        return {
+            "success": True,
+            "message": f"Sent to {successful}/{total} recipients",
+            "successful": successful,
+            "failed": failed,
+            "results": results
+        }
+
+    async def bulk_send_async(self, app_id: str, recipient_ids: List[str],
+                              message: str) -> Dict[str, Any]:
+        """Send message to multiple recipients concurrently"""
+        if not self._check_permission("bulk_send", RiskLevel.HIGH, {
+            "app": app_id,
+            "recipients": len(recipient_ids),
+            "message": message[:100]
+        }):
+            return {"success": False, "message": "Permission denied"}
+        
+        sends = await asyncio.gather(
+            *(self.send_message_async(app_id, rid, message) for rid in recipient_ids),
+            return_exceptions=True
+        )
+        
+        results = [
+            {"recipient_id": recipient_id,
+             "success": not isinstance(result, BaseException) and result["success"]}
+            for recipient_id, result in zip(recipient_ids, sends)
+        ]
+        return self._bulk_summary(results, len(recipient_ids))
 
 # Global instance
 enterchat_connector = EnterChatConnector()
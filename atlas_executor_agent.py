@@ -4,7 +4,7 @@ Executes planned actions using automation modules
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -19,14 +19,33 @@ from ..core.memory import memory_agent
 
 logger = get_logger(__name__)
 
+# Steps per automation log flush in execute_plan
+_LOG_BATCH_SIZE = 16
+
+@dataclass(slots=True)
+class StepResult:
+    """Result of executing one plan step"""
+    step_number: int
+    description: str
+    tool: str
+    action: str
+    result: Dict[str, Any]
+    duration_ms: int
+    success: bool
+
 @dataclass
 class ExecutionResult:
     """Result of executing a plan"""
     success: bool
     plan: ExecutionPlan
-    step_results: List[Dict[str, Any]]
+    step_results: List[StepResult]
     total_duration_ms: int
     message: str
+    
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """Step results as plain dicts, for JSON responses"""
+        return [{name: getattr(r, name) for name in StepResult.__slots__}
+                for r in self.step_results]
 
 class ExecutorAgent:
     """Executes planned actions"""
@@ -40,26 +59,46 @@ class ExecutorAgent:
             "workflow_engine": None,  # Will be set later
             "app_builder": None  # Will be set later
         }
+        
+        # Minimum seconds between consecutive calls to a rate-limited tool
+        self._min_gap = {"enterchat_connector": 0.05}
+        self._last_call_ts: Dict[str, float] = {}
+        
+        # (tool name, action) -> bound method; entries for a tool are dropped
+        # when its tool_map slot is rebound
+        self._dispatch: Dict[tuple, Callable] = {}
         logger.info("ExecutorAgent initialized")
     
     def set_workflow_engine(self, workflow_engine):
         """Set workflow engine reference"""
         self.tool_map["workflow_engine"] = workflow_engine
+        self._invalidate_dispatch("workflow_engine")
     
     def set_app_builder(self, app_builder):
         """Set app builder reference"""
         self.tool_map["app_builder"] = app_builder
+        self._invalidate_dispatch("app_builder")
+    
+    def _invalidate_dispatch(self, tool_name: str):
+        """Forget cached action methods for a tool"""
+        # list() snapshots the keys in one step; worker threads may be
+        # adding entries while we filter
+        for key in [k for k in list(self._dispatch) if k[0] == tool_name]:
+            self._dispatch.pop(key, None)
     
     def execute_plan(self, plan: ExecutionPlan) -> ExecutionResult:
         """Execute a complete plan"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         step_results = []
         overall_success = True
         
         logger.info(f"Executing plan with {len(plan.steps)} steps")
         
+        # Automation log entries, written in batches rather than per step
+        pending_logs = []
+        
         for i, step in enumerate(plan.steps):
-            step_start = time.time()
+            step_start_ns = time.perf_counter_ns()
             
             logger.info(f"Step {i+1}/{len(plan.steps)}: {step.description}")
             atlas_logger.log_agent_action(
@@ -68,46 +107,55 @@ class ExecutorAgent:
                 {"tool": step.tool, "action": step.action}
             )
             
+            # Space out calls to rate-limited tools; local tools run back to back
+            gap = self._min_gap.get(step.tool, 0)
+            if gap:
+                elapsed = time.monotonic() - self._last_call_ts.get(step.tool, 0)
+                if elapsed < gap:
+                    time.sleep(gap - elapsed)
+            
             # Execute step
             result = self._execute_step(step)
+            if gap:
+                self._last_call_ts[step.tool] = time.monotonic()
             
-            step_duration = int((time.time() - step_start) * 1000)
+            step_duration = (time.perf_counter_ns() - step_start_ns) // 1_000_000
             
-            step_results.append({
-                "step_number": i + 1,
-                "description": step.description,
-                "tool": step.tool,
-                "action": step.action,
-                "result": result,
-                "duration_ms": step_duration,
-                "success": result.get("success", False)
-            })
+            step_results.append(StepResult(
+                i + 1, step.description, step.tool, step.action,
+                result, step_duration, result.get("success", False)
+            ))
             
-            # Log to automation logger
-            atlas_logger.log_automation(
+            # Queue for the automation logger
+            pending_logs.append((
                 step.tool,
                 step.action,
                 "success" if result.get("success") else "failed",
                 step.params
-            )
+            ))
+            if len(pending_logs) >= _LOG_BATCH_SIZE:
+                atlas_logger.log_automation_batch(pending_logs)
+                pending_logs = []
             
             # If step failed and it's critical, stop execution
             if not result.get("success", False):
                 overall_success = False
                 if self._is_critical_step(step):
+                    # Flush now so the failure is on disk for post-mortems
+                    atlas_logger.log_automation_batch(pending_logs)
+                    pending_logs = []
                     logger.warning(f"Critical step failed: {step.description}")
                     break
-            
-            # Small delay between steps
-            time.sleep(0.1)
         
-        total_duration = int((time.time() - start_time) * 1000)
+        atlas_logger.log_automation_batch(pending_logs)
+        
+        total_duration = (time.perf_counter_ns() - start_ns) // 1_000_000
         
         # Create result summary
         if overall_success:
             message = f"Successfully executed {len(step_results)} steps"
         else:
-            failed_count = sum(1 for r in step_results if not r["success"])
+            failed_count = sum(1 for r in step_results if not r.success)
             message = f"Execution completed with {failed_count} failures"
         
         execution_result = ExecutionResult(
@@ -134,23 +182,24 @@ class ExecutorAgent:
     def _execute_step(self, step: PlanStep) -> Dict[str, Any]:
         """Execute a single step"""
         try:
-            # Get the tool
-            tool = self.tool_map.get(step.tool)
-            
-            if tool is None:
-                return {
-                    "success": False,
-                    "message": f"Tool not found: {step.tool}"
-                }
-            
-            # Get the action method
-            if not hasattr(tool, step.action):
-                return {
-                    "success": False,
-                    "message": f"Action not found: {step.action} in {step.tool}"
-                }
-            
-            action_method = getattr(tool, step.action)
+            # Resolve tool and action, cached after the first call
+            key = (step.tool, step.action)
+            action_method = self._dispatch.get(key)
+            if action_method is None:
+                tool = self.tool_map.get(step.tool)
+                if tool is None:
+                    return {
+                        "success": False,
+                        "message": f"Tool not found: {step.tool}"
+                    }
+                
+                action_method = getattr(tool, step.action, None)
+                if action_method is None:
+                    return {
+                        "success": False,
+                        "message": f"Action not found: {step.action} in {step.tool}"
+                    }
+                self._dispatch[key] = action_method
             
             # Execute action
             result = action_method(**step.params)
@@ -188,14 +237,15 @@ class ExecutorAgent:
     
     def get_execution_status(self) -> Dict[str, Any]:
         """Get current execution status"""
-        # Get recent usage stats
+        # Get recent usage stats, including rows still queued for writing
+        memory_agent.flush()
         recent_executions = memory_agent.db.fetch_all("""
             SELECT command, success, duration_ms, timestamp 
             FROM usage_stats 
-            WHERE agent = 'ExecutorAgent'
+            WHERE agent = ?
             ORDER BY timestamp DESC 
             LIMIT 10
-        """)
+        """, ("ExecutorAgent",))
         
         stats = []
         for row in recent_executions:
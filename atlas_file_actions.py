@@ -3,32 +3,340 @@ ShivAI Atlas - File Operations Module
 File and folder management automation
 """
 
+import errno
+import fnmatch
+import mmap
 import os
-import shutil
-from pathlib import Path
-from typing import Dict, Any, List, Optional
+import stat as stat_mod
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 import logging
 import time
-import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from ..core.config import config
 from ..core.logger import get_logger
 from ..core.permissions import permission_manager, PermissionType, RiskLevel
 
 logger = get_logger(__name__)
 
+# Buffer size for file reads/writes; the default 8 KiB costs extra syscalls on large files
+ATLAS_IO_BUFSIZE = 1 << 20
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy file data and metadata, like shutil.copy2 for a file target.
+
+    Tries copy_file_range() first so the kernel can clone or copy
+    server-side, then falls back to a 1 MiB read/write loop.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    flags = getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        # O_TRUNC on the source itself would wipe it before the copy starts
+        try:
+            dst_st = os.stat(dst)
+        except FileNotFoundError:
+            pass
+        else:
+            src_st = os.fstat(src_fd)
+            if (dst_st.st_dev, dst_st.st_ino) == (src_st.st_dev, src_st.st_ino):
+                import shutil
+                raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o666)
+        try:
+            remaining = os.fstat(src_fd).st_size
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_fd, dst_fd, min(remaining, 1 << 30))
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                        raise
+            # Finish (or do) the copy in userspace; both fds sit at the same offset
+            buf = bytearray(ATLAS_IO_BUFSIZE)
+            view = memoryview(buf)
+            with open(src_fd, "rb", buffering=0, closefd=False) as reader:
+                while True:
+                    n = reader.readinto(buf)
+                    if not n:
+                        break
+                    chunk = view[:n]
+                    while chunk:
+                        chunk = chunk[os.write(dst_fd, chunk):]
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    import shutil
+    shutil.copystat(src, dst)
+
+# Reads larger than this are decoded straight from a read-only mapping
+_MMAP_THRESHOLD = 4 << 20
+
+def _read_mapped(path: str, offset: int, n: int) -> Tuple[str, int]:
+    """Decode up to n bytes at offset from a mapping; returns (text, bytes read)"""
+    with open(path, 'rb', buffering=0) as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as whole, whole[offset:offset + n] as view:
+            return str(view, 'utf-8', 'replace'), len(view)
+
+# Most buffers handed to one writev() call (Linux IOV_MAX)
+_IOV_MAX = 1024
+
+def _write_chunks(path: str, chunks: List[bytes], append: bool = False) -> None:
+    """Write byte chunks with writev(), up to _IOV_MAX buffers per syscall"""
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(path, flags, 0o666)
+    try:
+        for start in range(0, len(chunks), _IOV_MAX):
+            batch = chunks[start:start + _IOV_MAX]
+            written = os.writev(fd, batch)
+            # Regular files only write short on errors like a full disk; finish the rest
+            if written < sum(map(len, batch)):
+                rest = memoryview(b"".join(batch))[written:]
+                while rest:
+                    rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
+
+def _move(source: str, destination: str) -> str:
+    """Move like shutil.move, trying a plain rename first; returns the final path"""
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(os.path.normpath(source)))
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Different filesystem: copy then remove the original
+        if os.path.isdir(source):
+            import shutil
+            shutil.move(source, destination)
+        else:
+            _fast_copy(source, destination)
+            os.remove(source)
+    return destination
+
+# Params that name filesystem paths, checked against config.safe_paths
+_PATH_PARAMS = ("path", "source", "dest", "old", "new")
+
+def _pairs_params(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Permission params for a batch: every (source, destination), so the
+    audit log names the files and a grant only covers this exact batch"""
+    return {"pairs": tuple((source, destination) for source, destination in pairs),
+            "count": len(pairs)}
+
+# Risk levels allowed to skip permission_manager inside safe paths
+_SAFE_PATH_RISKS = (RiskLevel.LOW, RiskLevel.MEDIUM)
+
+def _safe_prefixes() -> Tuple[str, ...]:
+    """config.safe_paths as normalised directory prefixes (with trailing separator)"""
+    return tuple(
+        os.path.join(os.path.normcase(os.path.realpath(os.path.expanduser(p))), "")
+        for p in config.safe_paths
+    )
+
+# Desktop organization folders and the extensions sorted into each
+_FOLDERS = {
+    "Documents": (".pdf", ".doc", ".docx", ".txt", ".xlsx", ".pptx"),
+    "Images": (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg"),
+    "Videos": (".mp4", ".avi", ".mkv", ".mov"),
+    "Music": (".mp3", ".wav", ".flac", ".m4a"),
+    "Archives": (".zip", ".rar", ".7z", ".tar", ".gz"),
+    "Programs": (".exe", ".msi")
+}
+_EXT_BUCKETS = {ext: name for name, exts in _FOLDERS.items() for ext in exts}
+
+# Concurrent stat() calls when listing/searching directories
+_STAT_WORKERS = 32
+
+def _listing_entry(item) -> Optional[Dict[str, Any]]:
+    """Describe a DirEntry for list_files; None if it vanished"""
+    try:
+        st = item.stat()
+    except OSError:
+        return None
+    return {
+        "name": item.name,
+        "path": os.path.abspath(item),
+        "size": st.st_size,
+        "modified": st.st_mtime,
+        "is_file": stat_mod.S_ISREG(st.st_mode),
+        "is_dir": stat_mod.S_ISDIR(st.st_mode)
+    }
+
+def _search_entry(item) -> Optional[Dict[str, Any]]:
+    """Describe a DirEntry for search_files; None if it vanished"""
+    try:
+        st = item.stat()
+    except OSError:
+        return None
+    is_file = stat_mod.S_ISREG(st.st_mode)
+    return {
+        "name": item.name,
+        "path": os.path.abspath(item),
+        "is_file": is_file,
+        "size": st.st_size if is_file else 0
+    }
+
+def _stat_all(describe, items) -> List[Dict[str, Any]]:
+    """Run describe over items on a thread pool so stat latency overlaps"""
+    items = list(items)
+    if len(items) < 2:
+        results = map(describe, items)
+        return [r for r in results if r is not None]
+    with ThreadPoolExecutor(max_workers=min(_STAT_WORKERS, len(items))) as executor:
+        return [r for r in executor.map(describe, items) if r is not None]
+
+def _scandir_matching(path: str, pattern: str, recursive: bool = False) -> List[os.DirEntry]:
+    """Entries under path whose names match a glob pattern.
+
+    Recursion is an explicit DFS over os.scandir so directory-ness comes
+    from the cached d_type; symlinked directories are not followed.
+    """
+    match_all = pattern == "*"
+    matches = []
+    pending = deque([path])
+    while pending:
+        current = pending.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            # Unreadable subdirectories are skipped, like Path.rglob does
+            if current == path:
+                raise
+            continue
+        with it:
+            for entry in it:
+                if match_all or fnmatch.fnmatch(entry.name, pattern):
+                    matches.append(entry)
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+    return matches
+
+def _batch_unlink(directory: str, names: List[str]) -> List[bool]:
+    """Unlink names inside one directory, resolving the directory once.
+
+    Uses unlinkat() against a single directory fd where the platform
+    supports it; elsewhere falls back to one full-path unlink per file.
+    Returns one success flag per name.
+    """
+    done = []
+    if os.unlink not in os.supports_dir_fd:
+        for name in names:
+            try:
+                os.unlink(os.path.join(directory, name))
+                done.append(True)
+            except OSError:
+                done.append(False)
+        return done
+
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        for name in names:
+            try:
+                os.unlink(name, dir_fd=dir_fd)
+                done.append(True)
+            except OSError:
+                done.append(False)
+    finally:
+        os.close(dir_fd)
+    return done
+
+# Worker threads (and name shards) used by clean_temp_files; a power of two
+_TEMP_SHARDS = 16
+
+def _clean_shard(directory: str, entries: List[os.DirEntry]) -> Tuple[int, int]:
+    """Delete one shard of temp entries; returns (items deleted, file bytes freed)"""
+    import shutil
+    count = 0
+    files = []
+    sizes = []
+    for entry in entries:
+        try:
+            if entry.is_file():
+                sizes.append(entry.stat().st_size)
+                files.append(entry.name)
+            elif entry.is_dir():
+                shutil.rmtree(entry.path)
+                count += 1
+        except OSError:
+            # In use, not ours, or already gone
+            pass
+    
+    freed = 0
+    for size, ok in zip(sizes, _batch_unlink(directory, files)):
+        if ok:
+            count += 1
+            freed += size
+    return count, freed
+
+def _batch_rename(directory: str, moves: List[Tuple[str, str]]) -> int:
+    """Rename (src, dst) pairs relative to one directory; returns moved count"""
+    moved = 0
+    if os.rename not in os.supports_dir_fd:
+        for src, dst in moves:
+            try:
+                os.rename(os.path.join(directory, src), os.path.join(directory, dst))
+                moved += 1
+            except OSError:
+                pass
+        return moved
+
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        for src, dst in moves:
+            try:
+                os.rename(src, dst, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                moved += 1
+            except OSError:
+                pass
+    finally:
+        os.close(dir_fd)
+    return moved
+
 class FileActions:
     """File and folder operations"""
     
     def __init__(self):
+        self._safe_prefixes = _safe_prefixes()
+        self._safe_prefixes_revision = config.revision
         logger.info("FileActions initialized")
     
     def _check_permission(self, action: str, risk_level: RiskLevel, params: dict = None) -> bool:
         """Check if file action is permitted"""
-        granted, reason = permission_manager.check_permission(
-            PermissionType.FILES, action, risk_level, params or {}
+        if self._safe_prefixes_revision != config.revision:
+            self._safe_prefixes = _safe_prefixes()
+            self._safe_prefixes_revision = config.revision
+        
+        # Atlas-owned directories: a prefix test instead of a policy check,
+        # still subject to the master file-access switch. realpath so a
+        # symlink inside a safe path can't point the action elsewhere
+        if params and risk_level in _SAFE_PATH_RISKS and config.permissions.can_access_files:
+            paths = [params[name] for name in _PATH_PARAMS if name in params]
+            paths.extend(path for pair in params.get("pairs", ()) for path in pair)
+            if paths and all(
+                os.path.normcase(os.path.realpath(p)).startswith(self._safe_prefixes) for p in paths
+            ):
+                permission_manager.audit_grant(PermissionType.FILES, action, risk_level,
+                                               {**params, "safe_path": True})
+                return True
+        
+        # A grant only covers the exact paths it was given for
+        params = params or {}
+        granted, reason = permission_manager.check_permission_cached(
+            PermissionType.FILES, action, risk_level, params,
+            scope=tuple(sorted(params.items()))
         )
         if not granted:
-            logger.warning(f"Permission denied for {action}: {reason}")
+            logger.warning("Permission denied for %s: %s", action, reason)
         return granted
     
     # ==================== FILE OPERATIONS ====================
@@ -39,49 +347,98 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            file_path = Path(path)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            parent = os.path.dirname(path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with open(path, 'w', encoding='utf-8', buffering=ATLAS_IO_BUFSIZE) as f:
                 f.write(content)
             
-            logger.info(f"Created file: {path}")
+            logger.info("Created file: %s", path)
             return {"success": True, "message": f"File created: {path}"}
         
         except Exception as e:
-            logger.error(f"Failed to create file {path}: {e}")
+            logger.error("Failed to create file %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
-    def read_file(self, path: str) -> Dict[str, Any]:
-        """Read file contents"""
+    def read_file(self, path: str, offset: int = 0, length: Optional[int] = None,
+                  max_bytes: int = 16 << 20) -> Dict[str, Any]:
+        """Read file contents.
+        
+        Reads `length` bytes from `offset` (default: the rest of the file)
+        into one preallocated buffer, or decodes them from an mmap for
+        reads over 4 MiB. At most `max_bytes` are read; `truncated` says
+        whether that cap cut the read short.
+        """
         if not self._check_permission("read_file", RiskLevel.LOW, {"path": path}):
             return {"success": False, "message": "Permission denied"}
         
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            remaining = max(os.stat(path).st_size - offset, 0)
+            wanted = remaining if length is None else min(length, remaining)
+            n = min(wanted, max_bytes)
+            if n > _MMAP_THRESHOLD:
+                content, got = _read_mapped(path, offset, n)
+            else:
+                buf = bytearray(n)
+                view = memoryview(buf)
+                got = 0
+                with open(path, 'rb', buffering=0) as f:
+                    if offset:
+                        f.seek(offset)
+                    while got < n:
+                        chunk = f.readinto(view[got:])
+                        if not chunk:
+                            break
+                        got += chunk
+                view.release()
+                del buf[got:]
+                
+                # Decode once from bytes instead of through TextIOWrapper
+                content = buf.decode('utf-8', 'replace')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
-            logger.info(f"Read file: {path}")
-            return {"success": True, "content": content, "size": len(content)}
+            logger.info("Read file: %s", path)
+            return {
+                "success": True,
+                "content": content,
+                "size": len(content),
+                "truncated": n < wanted
+            }
         
         except Exception as e:
-            logger.error(f"Failed to read file {path}: {e}")
+            logger.error("Failed to read file %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
-    def write_file(self, path: str, content: str, mode: str = 'w') -> Dict[str, Any]:
-        """Write content to file"""
+    def write_file(self, path: str, content: Union[str, Iterable[str]],
+                   mode: str = 'w') -> Dict[str, Any]:
+        """Write content to file.
+        
+        `content` may also be an iterable of string chunks (e.g. streamed
+        tokens); for 'w'/'a' these go out with writev() instead of one
+        write() per chunk.
+        """
         if not self._check_permission("write_file", RiskLevel.MEDIUM, {"path": path}):
             return {"success": False, "message": "Permission denied"}
         
         try:
-            with open(path, mode, encoding='utf-8') as f:
+            if not isinstance(content, str):
+                if mode in ('w', 'a') and hasattr(os, "writev"):
+                    _write_chunks(path, [chunk.encode('utf-8') for chunk in content], mode == 'a')
+                    logger.info("Wrote to file: %s", path)
+                    return {"success": True, "message": f"Content written to {path}"}
+                # Other modes, and Windows (no writev), take the text-file path
+                content = "".join(content)
+            
+            with open(path, mode, encoding='utf-8', buffering=ATLAS_IO_BUFSIZE) as f:
                 f.write(content)
             
-            logger.info(f"Wrote to file: {path}")
+            logger.info("Wrote to file: %s", path)
             return {"success": True, "message": f"Content written to {path}"}
         
         except Exception as e:
-            logger.error(f"Failed to write file {path}: {e}")
+            logger.error("Failed to write file %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     def delete_file(self, path: str) -> Dict[str, Any]:
@@ -91,11 +448,11 @@ class FileActions:
         
         try:
             os.remove(path)
-            logger.info(f"Deleted file: {path}")
+            logger.info("Deleted file: %s", path)
             return {"success": True, "message": f"Deleted: {path}"}
         
         except Exception as e:
-            logger.error(f"Failed to delete file {path}: {e}")
+            logger.error("Failed to delete file %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     def rename_file(self, old_path: str, new_path: str) -> Dict[str, Any]:
@@ -106,11 +463,11 @@ class FileActions:
         
         try:
             os.rename(old_path, new_path)
-            logger.info(f"Renamed: {old_path} -> {new_path}")
+            logger.info("Renamed: %s -> %s", old_path, new_path)
             return {"success": True, "message": f"Renamed to {new_path}"}
         
         except Exception as e:
-            logger.error(f"Failed to rename {old_path}: {e}")
+            logger.error("Failed to rename %s: %s", old_path, e)
             return {"success": False, "message": str(e)}
     
     def copy_file(self, source: str, destination: str) -> Dict[str, Any]:
@@ -120,12 +477,12 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            shutil.copy2(source, destination)
-            logger.info(f"Copied: {source} -> {destination}")
+            _fast_copy(source, destination)
+            logger.info("Copied: %s -> %s", source, destination)
             return {"success": True, "message": f"Copied to {destination}"}
         
         except Exception as e:
-            logger.error(f"Failed to copy {source}: {e}")
+            logger.error("Failed to copy %s: %s", source, e)
             return {"success": False, "message": str(e)}
     
     def move_file(self, source: str, destination: str) -> Dict[str, Any]:
@@ -135,38 +492,74 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            shutil.move(source, destination)
-            logger.info(f"Moved: {source} -> {destination}")
+            destination = _move(source, destination)
+            logger.info("Moved: %s -> %s", source, destination)
             return {"success": True, "message": f"Moved to {destination}"}
         
         except Exception as e:
-            logger.error(f"Failed to move {source}: {e}")
+            logger.error("Failed to move %s: %s", source, e)
             return {"success": False, "message": str(e)}
     
-    def get_file_info(self, path: str) -> Dict[str, Any]:
-        """Get file information"""
+    def copy_many(self, pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Copy several files under one permission check"""
+        if not self._check_permission("copy_many", RiskLevel.MEDIUM, _pairs_params(pairs)):
+            return {"success": False, "message": "Permission denied"}
+        return self._run_many("Copied", _fast_copy, pairs)
+    
+    def move_many(self, pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Move several files under one permission check"""
+        if not self._check_permission("move_many", RiskLevel.MEDIUM, _pairs_params(pairs)):
+            return {"success": False, "message": "Permission denied"}
+        return self._run_many("Moved", _move, pairs)
+    
+    def _run_many(self, verb: str, op, pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Apply op to each (source, destination) pair, collecting failures"""
+        done = 0
+        failed = []
+        for source, destination in pairs:
+            try:
+                op(source, destination)
+                done += 1
+            except Exception as e:
+                failed.append({"source": source, "message": str(e)})
+        
+        logger.info("%s %d of %d files", verb, done, len(pairs))
+        return {
+            "success": not failed,
+            "message": f"{verb} {done} of {len(pairs)} files",
+            "count": done,
+            "failed": failed
+        }
+    
+    def get_file_info(self, path: str, verbose: bool = False) -> Dict[str, Any]:
+        """Get file information.
+        
+        Times are raw epoch floats; `verbose` adds display strings
+        (size_mb, created_str, modified_str).
+        """
         try:
-            file_path = Path(path)
-            if not file_path.exists():
-                return {"success": False, "message": "File not found"}
-            
-            stat = file_path.stat()
+            st = os.stat(path)
             info = {
-                "name": file_path.name,
-                "path": str(file_path.absolute()),
-                "size": stat.st_size,
-                "size_mb": f"{stat.st_size / (1024**2):.2f}",
-                "created": time.ctime(stat.st_ctime),
-                "modified": time.ctime(stat.st_mtime),
-                "is_file": file_path.is_file(),
-                "is_dir": file_path.is_dir(),
-                "extension": file_path.suffix
+                "name": os.path.basename(path),
+                "path": os.path.abspath(path),
+                "size": st.st_size,
+                "created": st.st_ctime,
+                "modified": st.st_mtime,
+                "is_file": stat_mod.S_ISREG(st.st_mode),
+                "is_dir": stat_mod.S_ISDIR(st.st_mode),
+                "extension": os.path.splitext(path)[1]
             }
+            if verbose:
+                info["size_mb"] = f"{st.st_size / (1024**2):.2f}"
+                info["created_str"] = time.ctime(st.st_ctime)
+                info["modified_str"] = time.ctime(st.st_mtime)
             
             return {"success": True, "info": info}
         
+        except FileNotFoundError:
+            return {"success": False, "message": "File not found"}
         except Exception as e:
-            logger.error(f"Failed to get file info for {path}: {e}")
+            logger.error("Failed to get file info for %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     # ==================== FOLDER OPERATIONS ====================
@@ -177,12 +570,12 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            Path(path).mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created folder: {path}")
+            os.makedirs(path, exist_ok=True)
+            logger.info("Created folder: %s", path)
             return {"success": True, "message": f"Folder created: {path}"}
         
         except Exception as e:
-            logger.error(f"Failed to create folder {path}: {e}")
+            logger.error("Failed to create folder %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     def delete_folder(self, path: str, recursive: bool = False) -> Dict[str, Any]:
@@ -192,48 +585,31 @@ class FileActions:
         
         try:
             if recursive:
+                import shutil
                 shutil.rmtree(path)
             else:
                 os.rmdir(path)
             
-            logger.info(f"Deleted folder: {path}")
+            logger.info("Deleted folder: %s", path)
             return {"success": True, "message": f"Deleted: {path}"}
         
         except Exception as e:
-            logger.error(f"Failed to delete folder {path}: {e}")
+            logger.error("Failed to delete folder %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     def list_files(self, path: str, pattern: str = "*", recursive: bool = False) -> Dict[str, Any]:
         """List files in a directory"""
         try:
-            folder = Path(path)
-            if not folder.exists():
+            if not os.path.exists(path):
                 return {"success": False, "message": "Folder not found"}
             
-            files = []
-            if recursive:
-                items = folder.rglob(pattern)
-            else:
-                items = folder.glob(pattern)
-            
-            for item in items:
-                try:
-                    stat = item.stat()
-                    files.append({
-                        "name": item.name,
-                        "path": str(item.absolute()),
-                        "size": stat.st_size,
-                        "modified": time.ctime(stat.st_mtime),
-                        "is_file": item.is_file(),
-                        "is_dir": item.is_dir()
-                    })
-                except Exception:
-                    pass
+            items = _scandir_matching(path, pattern, recursive)
+            files = _stat_all(_listing_entry, items)
             
             return {"success": True, "files": files, "count": len(files)}
         
         except Exception as e:
-            logger.error(f"Failed to list files in {path}: {e}")
+            logger.error("Failed to list files in %s: %s", path, e)
             return {"success": False, "message": str(e)}
     
     def copy_folder(self, source: str, destination: str) -> Dict[str, Any]:
@@ -243,12 +619,13 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
+            import shutil
             shutil.copytree(source, destination)
-            logger.info(f"Copied folder: {source} -> {destination}")
+            logger.info("Copied folder: %s -> %s", source, destination)
             return {"success": True, "message": f"Copied to {destination}"}
         
         except Exception as e:
-            logger.error(f"Failed to copy folder {source}: {e}")
+            logger.error("Failed to copy folder %s: %s", source, e)
             return {"success": False, "message": str(e)}
     
     # ==================== ADVANCED OPERATIONS ====================
@@ -259,39 +636,31 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            desktop = Path.home() / "Desktop"
-            if not desktop.exists():
+            desktop = os.path.join(os.path.expanduser("~"), "Desktop")
+            if not os.path.exists(desktop):
                 return {"success": False, "message": "Desktop folder not found"}
             
             # Create organization folders
-            folders = {
-                "Documents": [".pdf", ".doc", ".docx", ".txt", ".xlsx", ".pptx"],
-                "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg"],
-                "Videos": [".mp4", ".avi", ".mkv", ".mov"],
-                "Music": [".mp3", ".wav", ".flac", ".m4a"],
-                "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
-                "Programs": [".exe", ".msi"]
-            }
+            for folder_name in _FOLDERS:
+                try:
+                    os.mkdir(os.path.join(desktop, folder_name))
+                except FileExistsError:
+                    pass
             
-            moved_count = 0
-            for folder_name, extensions in folders.items():
-                folder_path = desktop / folder_name
-                folder_path.mkdir(exist_ok=True)
-                
-                for ext in extensions:
-                    for file in desktop.glob(f"*{ext}"):
-                        if file.is_file():
-                            try:
-                                shutil.move(str(file), str(folder_path / file.name))
-                                moved_count += 1
-                            except Exception:
-                                pass
+            # One directory read; each file is bucketed by a single dict lookup
+            moves = []
+            with os.scandir(desktop) as it:
+                for entry in it:
+                    folder_name = _EXT_BUCKETS.get(os.path.splitext(entry.name)[1].lower())
+                    if folder_name and entry.is_file():
+                        moves.append((entry.name, os.path.join(folder_name, entry.name)))
+            moved_count = _batch_rename(desktop, moves)
             
-            logger.info(f"Organized desktop: moved {moved_count} files")
+            logger.info("Organized desktop: moved %s files", moved_count)
             return {"success": True, "message": f"Organized {moved_count} files", "count": moved_count}
         
         except Exception as e:
-            logger.error(f"Failed to organize desktop: {e}")
+            logger.error("Failed to organize desktop: %s", e)
             return {"success": False, "message": str(e)}
     
     def clean_temp_files(self) -> Dict[str, Any]:
@@ -301,26 +670,25 @@ class FileActions:
         
         try:
             import tempfile
-            temp_dir = Path(tempfile.gettempdir())
+            temp_dir = tempfile.gettempdir()
+            
+            with os.scandir(temp_dir) as it:
+                entries = list(it)
+            
+            # Shard by name so unlink/rmtree latency overlaps across workers
+            shards = [[] for _ in range(_TEMP_SHARDS)]
+            for entry in entries:
+                shards[hash(entry.name) & (_TEMP_SHARDS - 1)].append(entry)
             
             deleted_count = 0
             deleted_size = 0
-            
-            for item in temp_dir.iterdir():
-                try:
-                    if item.is_file():
-                        size = item.stat().st_size
-                        item.unlink()
-                        deleted_count += 1
-                        deleted_size += size
-                    elif item.is_dir():
-                        shutil.rmtree(item)
-                        deleted_count += 1
-                except Exception:
-                    pass
+            with ThreadPoolExecutor(max_workers=_TEMP_SHARDS) as executor:
+                for count, size in executor.map(_clean_shard, [temp_dir] * _TEMP_SHARDS, shards):
+                    deleted_count += count
+                    deleted_size += size
             
             size_mb = deleted_size / (1024**2)
-            logger.info(f"Cleaned temp files: {deleted_count} items, {size_mb:.2f} MB")
+            logger.info("Cleaned temp files: %s items, %.2f MB", deleted_count, size_mb)
             return {
                 "success": True, 
                 "message": f"Cleaned {deleted_count} items",
@@ -329,37 +697,22 @@ class FileActions:
             }
         
         except Exception as e:
-            logger.error(f"Failed to clean temp files: {e}")
+            logger.error("Failed to clean temp files: %s", e)
             return {"success": False, "message": str(e)}
     
     def search_files(self, directory: str, filename: str, recursive: bool = True) -> Dict[str, Any]:
         """Search for files by name"""
         try:
-            folder = Path(directory)
-            if not folder.exists():
+            if not os.path.exists(directory):
                 return {"success": False, "message": "Directory not found"}
             
-            results = []
-            if recursive:
-                items = folder.rglob(f"*{filename}*")
-            else:
-                items = folder.glob(f"*{filename}*")
-            
-            for item in items:
-                try:
-                    results.append({
-                        "name": item.name,
-                        "path": str(item.absolute()),
-                        "is_file": item.is_file(),
-                        "size": item.stat().st_size if item.is_file() else 0
-                    })
-                except Exception:
-                    pass
+            items = _scandir_matching(directory, f"*{filename}*", recursive)
+            results = _stat_all(_search_entry, items)
             
             return {"success": True, "results": results, "count": len(results)}
         
         except Exception as e:
-            logger.error(f"Failed to search files: {e}")
+            logger.error("Failed to search files: %s", e)
             return {"success": False, "message": str(e)}
     
     def create_backup(self, source: str, backup_name: Optional[str] = None) -> Dict[str, Any]:
@@ -368,26 +721,27 @@ class FileActions:
             return {"success": False, "message": "Permission denied"}
         
         try:
-            source_path = Path(source)
-            if not source_path.exists():
+            source = os.path.normpath(source)
+            if not os.path.exists(source):
                 return {"success": False, "message": "Source not found"}
             
             if backup_name is None:
                 timestamp = time.strftime("%Y%m%d_%H%M%S")
-                backup_name = f"{source_path.name}_backup_{timestamp}"
+                backup_name = f"{os.path.basename(source)}_backup_{timestamp}"
             
-            backup_path = source_path.parent / backup_name
+            backup_path = os.path.join(os.path.dirname(source), backup_name)
             
-            if source_path.is_file():
-                shutil.copy2(source, backup_path)
+            if os.path.isfile(source):
+                _fast_copy(source, backup_path)
             else:
+                import shutil
                 shutil.copytree(source, backup_path)
             
-            logger.info(f"Created backup: {backup_path}")
-            return {"success": True, "message": "Backup created", "path": str(backup_path)}
+            logger.info("Created backup: %s", backup_path)
+            return {"success": True, "message": "Backup created", "path": backup_path}
         
         except Exception as e:
-            logger.error(f"Failed to create backup: {e}")
+            logger.error("Failed to create backup: %s", e)
             return {"success": False, "message": str(e)}
 
 # Global instance
@@ -0,0 +1,36 @@
+"""
+ShivAI Atlas - Shared HTTP Session
+Process-wide requests session so connectors reuse pooled connections
+"""
+
+import atexit
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections kept per host
+POOL_MAXSIZE = 64
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Get the shared requests session, creating it on first use.
+
+    The session carries no default headers; connectors pass their own
+    (auth, content type) on each request.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                # Connectors do their own retrying
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                atexit.register(session.close)
+                _session = session
+    return _session
@@ -3,12 +3,18 @@ ShivAI Atlas - Logging System
 Centralized logging with file and console output
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, List, Tuple
+
+# Nothing here formats thread or process fields; skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
 
 class AtlasLogger:
     """Custom logger for ShivAI Atlas"""
@@ -31,6 +37,11 @@ class AtlasLogger:
         from .config import config, LOGS_DIR
         
         # Create formatters
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        
         detailed_formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
@@ -62,8 +73,23 @@ class AtlasLogger:
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(file_handler)
+        file_handler.setFormatter(file_formatter)
+        root_logger.addHandler(self._queued(file_handler))
+        
+        if root_logger.isEnabledFor(logging.DEBUG):
+            # Caller function/line only in debug.log, and only in debug mode
+            debug_handler = RotatingFileHandler(
+                LOGS_DIR / 'debug.log',
+                maxBytes=10*1024*1024,  # 10MB
+                backupCount=2,
+                encoding='utf-8'
+            )
+            debug_handler.setLevel(logging.DEBUG)
+            debug_handler.setFormatter(detailed_formatter)
+            root_logger.addHandler(self._queued(debug_handler))
+        else:
+            # No handler shows funcName/lineno, so skip the per-record stack walk
+            logging._srcfile = None
         
         # Create specialized loggers
         self.agent_logger = self._create_logger('atlas.agents', LOGS_DIR / 'agents.log')
@@ -87,10 +113,18 @@ class AtlasLogger:
             encoding='utf-8'
         )
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.addHandler(self._queued(handler))
         
         return logger
     
+    def _queued(self, handler: logging.Handler) -> QueueHandler:
+        """Front a file handler with a queue; a listener thread does the writes"""
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        return QueueHandler(log_queue)
+    
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger by name"""
         return logging.getLogger(name)
@@ -99,12 +133,25 @@ class AtlasLogger:
         """Log agent actions"""
         self.agent_logger.info(f"{agent_name} - {action} - {details}")
     
-    def log_automation(self, tool: str, action: str, result: str, params: dict = None):
-        """Log automation actions"""
+    @staticmethod
+    def _automation_msg(tool: str, action: str, result: str, params: dict = None) -> str:
+        """Format one automation log line"""
         msg = f"Tool: {tool} | Action: {action} | Result: {result}"
         if params:
             msg += f" | Params: {params}"
-        self.automation_logger.info(msg)
+        return msg
+    
+    def log_automation(self, tool: str, action: str, result: str, params: dict = None):
+        """Log automation actions"""
+        self.automation_logger.info(self._automation_msg(tool, action, result, params))
+    
+    def log_automation_batch(self, entries: List[Tuple[str, str, str, Optional[dict]]]):
+        """Log several automation actions as one record (one write per handler)"""
+        if entries and self.automation_logger.isEnabledFor(logging.INFO):
+            self.automation_logger.info(
+                "Batch of %d:\n%s", len(entries),
+                "\n".join(self._automation_msg(*entry) for entry in entries)
+            )
     
     def log_security_event(self, event_type: str, details: str, severity: str = "INFO"):
         """Log security-related events"""
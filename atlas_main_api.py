@@ -3,34 +3,91 @@ ShivAI Atlas - Main API Server
 FastAPI-based REST API for Atlas frontend
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from typing import Optional, Dict, Any, List
+from pathlib import Path
+from functools import lru_cache
+import asyncio
+import importlib.util
+import sqlite3
+import sys
 import uvicorn
 import logging
 
+import msgspec
+import orjson
+
 from core.config import config
 from core.logger import get_logger, atlas_logger
 from core.permissions import permission_manager
 from core.memory import memory_agent
 
-from agents.planner_agent import planner_agent
-from agents.executor_agent import executor_agent
-
-from automation.pc_actions import pc_actions
-from automation.file_actions import file_actions
-from automation.android_bridge import android_bridge
-from automation.enterchat_connector import enterchat_connector
-
 logger = get_logger(__name__)
 
+# Agents and connectors pull in automation/network libraries; import them
+# on first use so workers only load what their routes need
+
+@lru_cache(maxsize=1)
+def _planner():
+    from agents.planner_agent import planner_agent
+    return planner_agent
+
+@lru_cache(maxsize=1)
+def _executor():
+    from agents.executor_agent import executor_agent
+    return executor_agent
+
+@lru_cache(maxsize=1)
+def _android():
+    from automation.android_bridge import android_bridge
+    return android_bridge
+
+@lru_cache(maxsize=1)
+def _enterchat():
+    from automation.enterchat_connector import enterchat_connector
+    return enterchat_connector
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the few types orjson doesn't handle natively"""
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class AtlasJSONResponse(ORJSONResponse):
+    """orjson response that also accepts DB rows and paths.
+    
+    Returning one directly from an endpoint skips jsonable_encoder.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+# Serialized config-derived payloads, dropped whenever config.revision changes
+_json_cache: Dict[str, bytes] = {}
+_json_cache_revision = -1
+
+def _cached_json(key: str, build) -> bytes:
+    """orjson bytes of build(), reused until the next config load/save/update"""
+    global _json_cache_revision
+    if _json_cache_revision != config.revision:
+        _json_cache.clear()
+        _json_cache_revision = config.revision
+    data = _json_cache.get(key)
+    if data is None:
+        data = _json_cache[key] = orjson.dumps(build(), default=_json_default)
+    return data
+
 # Initialize FastAPI app
 app = FastAPI(
     title="ShivAI Atlas API",
     description="Local AI Agent OS API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=AtlasJSONResponse
 )
 
 # CORS middleware
@@ -42,74 +99,102 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inbox, audit log and workflow listings can run to tens of KB
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ==================== Request Models ====================
 
-class CommandRequest(BaseModel):
+class CommandRequest(msgspec.Struct):
     command: str
     dry_run: bool = False
 
-class ActionRequest(BaseModel):
+class ActionRequest(msgspec.Struct):
     tool: str
     action: str
     params: Dict[str, Any]
 
-class PermissionUpdate(BaseModel):
+class PermissionUpdate(msgspec.Struct):
     permission_type: str
     enabled: bool
     ask_every_time: Optional[bool] = None
 
-class ConfigUpdate(BaseModel):
+class ConfigUpdate(msgspec.Struct):
     section: str
     data: Dict[str, Any]
 
+def json_body(model: type):
+    """Dependency that decodes and validates the request body as `model`"""
+    async def decode(request: Request):
+        try:
+            return msgspec.json.decode(await request.body(), type=model)
+        except msgspec.DecodeError as e:
+            # ValidationError subclasses DecodeError
+            raise HTTPException(status_code=422, detail=str(e))
+    return decode
+
 # ==================== Health & Status ====================
 
-@app.get("/api/health")
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "version": "1.0.0", "agent": "ShivAI Atlas"})
+
+@app.get("/api/health", response_model=None)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "agent": "ShivAI Atlas"
-    }
+    return Response(_HEALTH_BODY, media_type="application/json")
 
-@app.get("/api/status")
+@app.get("/api/status", response_model=None)
 async def get_status():
     """Get system status"""
-    return {
+    # Only the service flags change between config revisions
+    return AtlasJSONResponse({
         "success": True,
         "status": {
-            "permissions": {
-                "files": config.permissions.can_access_files,
-                "keyboard_mouse": config.permissions.can_control_keyboard_mouse,
-                "screen": config.permissions.can_capture_screen,
-                "android": config.permissions.can_control_android,
-                "enterchat": config.permissions.can_control_enterchat,
-            },
+            "permissions": orjson.Fragment(_cached_json("status_permissions", _status_permissions)),
             "services": {
-                "android_connected": android_bridge.connected,
-                "enterchat_connected": enterchat_connector.connected,
+                # Not imported yet means nothing has connected it
+                "android_connected": "automation.android_bridge" in sys.modules and _android().connected,
+                "enterchat_connected": "automation.enterchat_connector" in sys.modules and _enterchat().connected,
             },
-            "config": config.to_dict()
+            "config": orjson.Fragment(_cached_json("config", config.to_dict))
         }
+    })
+
+def _status_permissions() -> Dict[str, bool]:
+    """Permission flags shown in /api/status"""
+    return {
+        "files": config.permissions.can_access_files,
+        "keyboard_mouse": config.permissions.can_control_keyboard_mouse,
+        "screen": config.permissions.can_capture_screen,
+        "android": config.permissions.can_control_android,
+        "enterchat": config.permissions.can_control_enterchat,
     }
 
 # ==================== Command Execution ====================
 
-@app.post("/api/command")
-async def execute_command(request: CommandRequest, background_tasks: BackgroundTasks):
+# Planning and execution block, so they run on worker threads; this caps
+# how many commands hold a thread at once
+_COMMAND_SLOTS = asyncio.Semaphore(8)
+
+def _plan_command(command: str):
+    """Create and optimize a plan in one worker-thread hop"""
+    planner = _planner()
+    return planner.optimize_plan(planner.create_plan(command))
+
+@app.post("/api/command", response_model=None)
+async def execute_command(background_tasks: BackgroundTasks,
+                          request: CommandRequest = Depends(json_body(CommandRequest))):
     """Execute a natural language command"""
     try:
         logger.info(f"Received command: {request.command}")
         
         # Parse and plan
-        plan = planner_agent.create_plan(request.command)
-        plan = planner_agent.optimize_plan(plan)
+        async with _COMMAND_SLOTS:
+            plan = await asyncio.to_thread(_plan_command, request.command)
         
         # Dry run mode
         if request.dry_run:
-            result = executor_agent.dry_run(plan)
-            return {
+            async with _COMMAND_SLOTS:
+                result = await asyncio.to_thread(_executor().dry_run, plan)
+            return AtlasJSONResponse({
                 "success": True,
                 "mode": "dry_run",
                 "plan": {
@@ -119,11 +204,11 @@ async def execute_command(request: CommandRequest, background_tasks: BackgroundT
                     "requires_confirmation": plan.requires_confirmation
                 },
                 "result": result
-            }
+            })
         
         # Check if confirmation required
         if plan.requires_confirmation:
-            return {
+            return AtlasJSONResponse({
                 "success": False,
                 "requires_confirmation": True,
                 "plan": {
@@ -138,20 +223,22 @@ async def execute_command(request: CommandRequest, background_tasks: BackgroundT
                     ]
                 },
                 "message": "This action requires user confirmation"
-            }
+            })
         
         # Execute plan
-        execution_result = executor_agent.execute_plan(plan)
+        async with _COMMAND_SLOTS:
+            execution_result = await asyncio.to_thread(_executor().execute_plan, plan)
         
         # Save conversation
-        memory_agent.save_conversation(
+        await asyncio.to_thread(
+            memory_agent.save_conversation,
             user_input=request.command,
             agent_response=execution_result.message,
             intent=plan.intent,
             confidence=plan.confidence
         )
         
-        return {
+        return AtlasJSONResponse({
             "success": execution_result.success,
             "message": execution_result.message,
             "plan": {
@@ -162,33 +249,39 @@ async def execute_command(request: CommandRequest, background_tasks: BackgroundT
             "execution": {
                 "duration_ms": execution_result.total_duration_ms,
                 "steps_executed": len(execution_result.step_results),
-                "step_results": execution_result.step_results
+                "step_results": execution_result.as_dicts()
             }
-        }
+        })
     
     except Exception as e:
         logger.error(f"Command execution failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/action")
-async def execute_action(request: ActionRequest):
+@app.post("/api/action", response_model=None)
+async def execute_action(request: ActionRequest = Depends(json_body(ActionRequest))):
     """Execute a direct action"""
     try:
-        result = executor_agent.execute_single_action(
-            request.tool,
-            request.action,
-            request.params
-        )
-        return result
+        async with _COMMAND_SLOTS:
+            result = await asyncio.to_thread(
+                _executor().execute_single_action,
+                request.tool,
+                request.action,
+                request.params
+            )
+        return AtlasJSONResponse(result)
     except Exception as e:
         logger.error(f"Action execution failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # ==================== Permissions ====================
 
-@app.get("/api/permissions")
+@app.get("/api/permissions", response_model=None)
 async def get_permissions():
     """Get current permissions"""
+    return Response(_cached_json("permissions", _permissions_payload), media_type="application/json")
+
+def _permissions_payload() -> Dict[str, Any]:
+    """/api/permissions response body"""
     return {
         "success": True,
         "permissions": {
@@ -221,40 +314,33 @@ async def get_permissions():
         }
     }
 
+# permission_type -> (enabled flag, ask-every-time flag or None) on config.permissions
+_PERM_ATTRS = {
+    "files": ("can_access_files", "ask_every_time_files"),
+    "keyboard_mouse": ("can_control_keyboard_mouse", "ask_every_time_keyboard"),
+    "screen_capture": ("can_capture_screen", "ask_every_time_screen"),
+    "android": ("can_control_android", "ask_every_time_android"),
+    "enterchat": ("can_control_enterchat", "ask_every_time_enterchat"),
+    "network": ("can_use_network", None),
+    "ai_remote": ("can_use_ai_remote", None),
+}
+
 @app.post("/api/permissions/update")
-async def update_permission(update: PermissionUpdate):
+async def update_permission(update: PermissionUpdate = Depends(json_body(PermissionUpdate))):
     """Update a permission"""
+    perm_type = update.permission_type
     try:
-        perm_type = update.permission_type
-        
-        if perm_type == "files":
-            config.permissions.can_access_files = update.enabled
-            if update.ask_every_time is not None:
-                config.permissions.ask_every_time_files = update.ask_every_time
-        elif perm_type == "keyboard_mouse":
-            config.permissions.can_control_keyboard_mouse = update.enabled
-            if update.ask_every_time is not None:
-                config.permissions.ask_every_time_keyboard = update.ask_every_time
-        elif perm_type == "screen_capture":
-            config.permissions.can_capture_screen = update.enabled
-            if update.ask_every_time is not None:
-                config.permissions.ask_every_time_screen = update.ask_every_time
-        elif perm_type == "android":
-            config.permissions.can_control_android = update.enabled
-            if update.ask_every_time is not None:
-                config.permissions.ask_every_time_android = update.ask_every_time
-        elif perm_type == "enterchat":
-            config.permissions.can_control_enterchat = update.enabled
-            if update.ask_every_time is not None:
-                config.permissions.ask_every_time_enterchat = update.ask_every_time
-        elif perm_type == "network":
-            config.permissions.can_use_network = update.enabled
-        elif perm_type == "ai_remote":
-            config.permissions.can_use_ai_remote = update.enabled
-        else:
-            raise HTTPException(status_code=400, detail="Invalid permission type")
-        
-        config.save()
+        enabled_attr, ask_attr = _PERM_ATTRS[perm_type]
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Invalid permission type")
+    
+    values = {enabled_attr: update.enabled}
+    if ask_attr and update.ask_every_time is not None:
+        values[ask_attr] = update.ask_every_time
+    
+    try:
+        # update() bumps config.revision, so permission caches drop at once
+        config.update("permissions", **values)
         
         atlas_logger.log_security_event(
             "PERMISSION_UPDATE",
@@ -262,17 +348,20 @@ async def update_permission(update: PermissionUpdate):
             "INFO"
         )
         
-        return {"success": True, "message": "Permission updated"}
-    
+        saved = config.save()
     except Exception as e:
         logger.error(f"Failed to update permission: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not saved:
+        raise HTTPException(status_code=500, detail="Permission updated but not saved")
+    return {"success": True, "message": "Permission updated"}
 
-@app.get("/api/permissions/pending")
+@app.get("/api/permissions/pending", response_model=None)
 async def get_pending_requests():
     """Get pending permission requests"""
     requests = permission_manager.get_pending_requests()
-    return {"success": True, "requests": requests, "count": len(requests)}
+    return AtlasJSONResponse({"success": True, "requests": requests, "count": len(requests)})
 
 @app.post("/api/permissions/approve/{index}")
 async def approve_request(index: int):
@@ -290,113 +379,113 @@ async def deny_request(index: int):
         return {"success": True, "message": "Request denied"}
     raise HTTPException(status_code=400, detail="Invalid request index")
 
-@app.get("/api/audit-log")
+@app.get("/api/audit-log", response_model=None)
 async def get_audit_log(limit: int = 100, permission_type: Optional[str] = None):
     """Get audit log"""
     logs = permission_manager.get_audit_log(limit, permission_type)
-    return {"success": True, "logs": logs, "count": len(logs)}
+    return AtlasJSONResponse({"success": True, "logs": logs, "count": len(logs)})
 
 # ==================== Memory & History ====================
 
-@app.get("/api/conversations")
+@app.get("/api/conversations", response_model=None)
 async def get_conversations(limit: int = 20):
     """Get conversation history"""
-    conversations = memory_agent.get_recent_conversations(limit)
-    return {"success": True, "conversations": conversations}
+    # SQLite calls block; keep them off the event loop
+    conversations = await asyncio.to_thread(memory_agent.get_recent_conversations, limit)
+    return AtlasJSONResponse({"success": True, "conversations": conversations})
 
-@app.get("/api/workflows")
+@app.get("/api/workflows", response_model=None)
 async def list_workflows(category: Optional[str] = None):
     """List saved workflows"""
-    workflows = memory_agent.list_workflows(category)
-    return {"success": True, "workflows": workflows, "count": len(workflows)}
+    workflows = await asyncio.to_thread(memory_agent.list_workflows, category)
+    return AtlasJSONResponse({"success": True, "workflows": workflows, "count": len(workflows)})
 
-@app.get("/api/workflows/suggestions")
+@app.get("/api/workflows/suggestions", response_model=None)
 async def get_workflow_suggestions():
     """Get workflow suggestions based on usage"""
-    suggestions = memory_agent.suggest_workflows(5)
-    return {"success": True, "suggestions": suggestions}
+    suggestions = await asyncio.to_thread(memory_agent.suggest_workflows, 5)
+    return AtlasJSONResponse({"success": True, "suggestions": suggestions})
 
 # ==================== Android Control ====================
 
-@app.get("/api/android/devices")
+@app.get("/api/android/devices", response_model=None)
 async def list_android_devices():
     """List connected Android devices"""
-    result = android_bridge.list_devices()
-    return result
+    result = _android().list_devices()
+    return AtlasJSONResponse(result)
 
-@app.post("/api/android/connect")
+@app.post("/api/android/connect", response_model=None)
 async def connect_android(device_id: Optional[str] = None):
     """Connect to Android device"""
-    result = android_bridge.connect_device(device_id)
-    return result
+    result = _android().connect_device(device_id)
+    return AtlasJSONResponse(result)
 
-@app.get("/api/android/info")
+@app.get("/api/android/info", response_model=None)
 async def get_android_info():
     """Get Android device info"""
-    result = android_bridge.get_device_info()
-    return result
+    result = _android().get_device_info()
+    return AtlasJSONResponse(result)
 
-@app.get("/api/android/battery")
+@app.get("/api/android/battery", response_model=None)
 async def get_android_battery():
     """Get Android battery status"""
-    result = android_bridge.get_battery_status()
-    return result
+    result = _android().get_battery_status()
+    return AtlasJSONResponse(result)
 
 # ==================== EnterChat Integration ====================
 
-@app.get("/api/enterchat/status")
+@app.get("/api/enterchat/status", response_model=None)
 async def get_enterchat_status():
     """Check EnterChat connection"""
-    result = enterchat_connector.check_connection()
-    return result
+    result = _enterchat().check_connection()
+    return AtlasJSONResponse(result)
 
-@app.get("/api/enterchat/apps")
+@app.get("/api/enterchat/apps", response_model=None)
 async def get_enterchat_apps():
     """Get supported messaging apps"""
-    result = enterchat_connector.get_supported_apps()
-    return result
+    result = _enterchat().get_supported_apps()
+    return AtlasJSONResponse(result)
 
-@app.get("/api/enterchat/inbox")
+@app.get("/api/enterchat/inbox", response_model=None)
 async def get_unified_inbox(limit: int = 50):
     """Get unified inbox"""
-    result = enterchat_connector.get_unified_inbox(limit)
-    return result
+    result = _enterchat().get_unified_inbox(limit)
+    return AtlasJSONResponse(result)
 
-@app.get("/api/enterchat/unread")
+@app.get("/api/enterchat/unread", response_model=None)
 async def get_unread_count():
     """Get unread message count"""
-    result = enterchat_connector.get_unread_count()
-    return result
+    result = _enterchat().get_unread_count()
+    return AtlasJSONResponse(result)
 
 # ==================== Configuration ====================
 
-@app.get("/api/config")
+@app.get("/api/config", response_model=None)
 async def get_config():
     """Get full configuration"""
-    return {"success": True, "config": config.to_dict()}
+    return Response(_cached_json("config_response", lambda: {"success": True, "config": config.to_dict()}),
+                    media_type="application/json")
+
+# Sections /api/config/update may change
+_CONFIG_SECTIONS = ("voice", "android", "enterchat")
 
 @app.post("/api/config/update")
-async def update_config(update: ConfigUpdate):
+async def update_config(update: ConfigUpdate = Depends(json_body(ConfigUpdate))):
     """Update configuration"""
     try:
-        if update.section == "voice":
-            for key, value in update.data.items():
-                if hasattr(config.voice, key):
-                    setattr(config.voice, key, value)
-        elif update.section == "android":
-            for key, value in update.data.items():
-                if hasattr(config.android, key):
-                    setattr(config.android, key, value)
-        elif update.section == "enterchat":
-            for key, value in update.data.items():
-                if hasattr(config.enterchat, key):
-                    setattr(config.enterchat, key, value)
+        if update.section in _CONFIG_SECTIONS:
+            target = getattr(config, update.section)
+            config.update(update.section, **{
+                key: value for key, value in update.data.items() if hasattr(target, key)
+            })
         
-        config.save()
-        return {"success": True, "message": "Configuration updated"}
-    
+        saved = config.save()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not saved:
+        raise HTTPException(status_code=500, detail="Configuration updated but not saved")
+    return {"success": True, "message": "Configuration updated"}
 
 # ==================== Startup & Shutdown ====================
 
@@ -410,18 +499,24 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("ShivAI Atlas API shutting down...")
-    memory_agent.db.close()
+    memory_agent.close()
 
 # ==================== Main ====================
 
 def main():
     """Run the API server"""
+    # uvloop/httptools come with uvicorn[standard]; uvloop has no Windows build
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
     uvicorn.run(
         "main:app",
         host=config.server_host,
         port=config.server_port,
         reload=config.debug_mode,
-        log_level="info"
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        access_log=config.debug_mode,
+        log_level="info" if config.debug_mode else "warning"
     )
 
 if __name__ == "__main__":
@@ -3,24 +3,97 @@ ShivAI Atlas - Memory Agent & Database
 Long-term memory storage and retrieval system
 """
 
+import atexit
+import queue
 import sqlite3
-import json
+import threading
+import weakref
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple
 from pathlib import Path
 import logging
 
+import orjson
+
 from .config import config
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Queued writes go out every _FLUSH_INTERVAL seconds, or sooner once
+# _FLUSH_MAX_ROWS are waiting, one transaction per batch
+_FLUSH_MAX_ROWS = 256
+_FLUSH_INTERVAL = 0.05
+
+_SQL_INSERT_CONVERSATION = """
+    INSERT INTO conversations (user_input, agent_response, intent, confidence, metadata)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_USAGE = """
+    INSERT INTO usage_stats (command, agent, success, duration_ms, metadata)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_BUMP_WORKFLOW_USAGE = """
+    UPDATE workflows
+    SET usage_count = usage_count + ?, last_used = CURRENT_TIMESTAMP
+    WHERE name = ?
+"""
+_SQL_UPSERT_MEMORY = """
+    INSERT OR REPLACE INTO memories (key, value, category, metadata, updated_at)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+_SQL_UPSERT_WORKFLOW = """
+    INSERT OR REPLACE INTO workflows (name, description, steps, category)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_UPSERT_PREFERENCE = """
+    INSERT OR REPLACE INTO user_preferences (key, value, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+"""
+_SQL_DELETE_WORKFLOW = "DELETE FROM workflows WHERE name = ?"
+_SQL_RECENT_CONVERSATIONS = "SELECT * FROM conversations ORDER BY timestamp DESC LIMIT ?"
+_SQL_LIST_WORKFLOWS = "SELECT * FROM workflows WHERE enabled = 1 ORDER BY name"
+_SQL_LIST_WORKFLOWS_IN = "SELECT * FROM workflows WHERE category = ? AND enabled = 1 ORDER BY name"
+_SQL_SUGGEST_WORKFLOWS = """
+    SELECT * FROM workflows
+    WHERE enabled = 1
+    ORDER BY usage_count DESC, last_used DESC
+    LIMIT ?
+"""
+
+def _dumps(value: Any) -> str:
+    """Serialize a value for a TEXT column"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# Settings for per-thread read connections (journal_mode is per database)
+_READER_PRAGMAS = """
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-16384;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA busy_timeout=5000;
+"""
+
+class _Reader:
+    """Thread-local holder for a read connection; closes it when the thread exits"""
+    __slots__ = ("conn", "__weakref__")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
 class MemoryDatabase:
-    """SQLite database for Atlas memory"""
+    """SQLite database for Atlas memory.
+    
+    Writes share one connection under a lock; reads use a read-only
+    connection per thread, which WAL lets run alongside the writer.
+    """
     
     def __init__(self, db_path: Path = None):
         self.db_path = db_path or config.db_path
         self.conn = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: Set[sqlite3.Connection] = set()
+        self._readers_lock = threading.Lock()
         self._init_database()
     
     def _init_database(self):
@@ -29,6 +102,16 @@ class MemoryDatabase:
             self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
             
+            # WAL lets reads run alongside a write and needs fewer fsyncs per commit
+            self.conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA mmap_size=268435456;
+                PRAGMA cache_size=-65536;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA busy_timeout=5000;
+            """)
+            
             cursor = self.conn.cursor()
             
             # Memories table
@@ -58,6 +141,10 @@ class MemoryDatabase:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_wf_usage
+                ON workflows(enabled, usage_count DESC, last_used DESC)
+            """)
             
             # Usage stats table
             cursor.execute("""
@@ -71,6 +158,10 @@ class MemoryDatabase:
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS ix_usage_stats_agent_ts
+                ON usage_stats(agent, timestamp DESC)
+            """)
             
             # Conversation history table
             cursor.execute("""
@@ -84,6 +175,10 @@ class MemoryDatabase:
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_conv_ts
+                ON conversations(timestamp DESC)
+            """)
             
             # User preferences table
             cursor.execute("""
@@ -103,47 +198,164 @@ class MemoryDatabase:
             raise
     
     def close(self):
-        """Close database connection"""
+        """Close database connections"""
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
         if self.conn:
             self.conn.close()
     
+    def _get_read_conn(self) -> sqlite3.Connection:
+        """This thread's read-only connection, opened on first use"""
+        holder = getattr(self._local, "reader", None)
+        if holder is None:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_READER_PRAGMAS)
+            with self._readers_lock:
+                self._readers.add(conn)
+            # Worker threads come and go; the holder dies with its thread's locals
+            holder = self._local.reader = _Reader(conn)
+            weakref.finalize(holder, self._release_reader, conn)
+        return holder.conn
+    
+    def _release_reader(self, conn: sqlite3.Connection):
+        """Close a read connection whose thread has exited"""
+        with self._readers_lock:
+            self._readers.discard(conn)
+        conn.close()
+    
     def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
         """Execute a query"""
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        self.conn.commit()
-        return cursor
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+            self.conn.commit()
+            return cursor
+    
+    def execute_batches(self, batches: Iterable[Tuple[str, List[tuple]]]):
+        """Run executemany() for each (query, rows) pair in a single transaction"""
+        with self._lock, self.conn:
+            for query, rows in batches:
+                self.conn.executemany(query, rows)
     
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """Fetch one result"""
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        return cursor.fetchone()
+        return self._get_read_conn().execute(query, params).fetchone()
     
     def fetch_all(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Fetch all results"""
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        return self._get_read_conn().execute(query, params).fetchall()
 
 class MemoryAgent:
     """Agent for managing long-term memory"""
     
     def __init__(self):
         self.db = MemoryDatabase()
+        
+        # Conversation/usage rows waiting for the writer thread
+        self._write_queue: "queue.SimpleQueue[Tuple[str, tuple]]" = queue.SimpleQueue()
+        self._batch_ready = threading.Event()
+        self._flush_lock = threading.Lock()
+        
+        # Workflow usage increments, coalesced per name until the next flush
+        self._usage_counts: Dict[str, int] = {}
+        self._usage_lock = threading.Lock()
+        
+        # Workflow rows (steps still JSON) keyed by query; _workflows_gen moves
+        # on every workflow write so a read that raced one isn't cached
+        self._workflows_cache: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._workflows_gen = 0
+        
+        threading.Thread(target=self._flush_loop, name="memory-writer", daemon=True).start()
+        atexit.register(self.flush)
         logger.info("MemoryAgent initialized")
     
+    def _enqueue(self, query: str, params: tuple):
+        """Queue one write for the writer thread"""
+        self._write_queue.put((query, params))
+        if self._write_queue.qsize() >= _FLUSH_MAX_ROWS:
+            self._batch_ready.set()
+    
+    def _flush_loop(self):
+        """Writer thread: flush every _FLUSH_INTERVAL or when a batch fills up"""
+        while True:
+            self._batch_ready.wait(_FLUSH_INTERVAL)
+            self._batch_ready.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write all queued rows now (also called before reads that need them)"""
+        with self._flush_lock:
+            while True:
+                rows: Dict[str, List[tuple]] = {}
+                for _ in range(_FLUSH_MAX_ROWS):
+                    try:
+                        query, params = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    rows.setdefault(query, []).append(params)
+                
+                with self._usage_lock:
+                    usage, self._usage_counts = self._usage_counts, {}
+                if usage:
+                    rows[_SQL_BUMP_WORKFLOW_USAGE] = [(n, name) for name, n in usage.items()]
+                
+                if not rows:
+                    return
+                try:
+                    self.db.execute_batches(rows.items())
+                except Exception as e:
+                    # Keep everything for the next flush rather than drop it
+                    logger.error(f"Failed to write queued memory rows, will retry: {e}")
+                    self._requeue(rows, usage)
+                    return
+                if usage:
+                    self._invalidate_workflows()
+    
+    def _requeue(self, rows: Dict[str, List[tuple]], usage: Dict[str, int]):
+        """Put back rows and usage counts from a batch that failed to write"""
+        for query, params_list in rows.items():
+            if query is not _SQL_BUMP_WORKFLOW_USAGE:
+                for params in params_list:
+                    self._write_queue.put((query, params))
+        with self._usage_lock:
+            for name, n in usage.items():
+                self._usage_counts[name] = self._usage_counts.get(name, 0) + n
+    
+    def _invalidate_workflows(self):
+        """Drop cached workflow listings after a workflow write"""
+        self._workflows_gen += 1
+        self._workflows_cache = {}
+    
+    def _cached_workflows(self, key: tuple, query: str, params: tuple) -> List[Dict[str, Any]]:
+        """Workflow rows with decoded steps; rows are cached until the next workflow write.
+        
+        Steps are decoded per call so callers get objects they can modify
+        without touching the cache.
+        """
+        rows = self._workflows_cache.get(key)
+        if rows is None:
+            gen = self._workflows_gen
+            rows = [dict(row) for row in self.db.fetch_all(query, params)]
+            if gen == self._workflows_gen:
+                self._workflows_cache[key] = rows
+        return [{**row, 'steps': orjson.loads(row['steps'])} for row in rows]
+    
+    def close(self):
+        """Flush queued writes and close the database"""
+        self.flush()
+        self.db.close()
+    
     def remember(self, key: str, value: Any, category: str = "general", 
                 metadata: Dict[str, Any] = None) -> bool:
         """Store a memory"""
         try:
-            value_str = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
-            metadata_str = json.dumps(metadata or {}, ensure_ascii=False)
+            value_str = _dumps(value) if not isinstance(value, str) else value
+            metadata_str = _dumps(metadata or {})
             
-            self.db.execute("""
-                INSERT OR REPLACE INTO memories (key, value, category, metadata, updated_at)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, value_str, category, metadata_str))
+            self.db.execute(_SQL_UPSERT_MEMORY, (key, value_str, category, metadata_str))
             
             logger.info(f"Memory stored: {key}")
             return True
@@ -157,8 +369,8 @@ class MemoryAgent:
             row = self.db.fetch_one("SELECT value FROM memories WHERE key = ?", (key,))
             if row:
                 try:
-                    return json.loads(row['value'])
-                except json.JSONDecodeError:
+                    return orjson.loads(row['value'])
+                except orjson.JSONDecodeError:
                     return row['value']
             return None
         except Exception as e:
@@ -199,11 +411,9 @@ class MemoryAgent:
                      category: str = "custom") -> bool:
         """Save a workflow"""
         try:
-            steps_str = json.dumps(steps, ensure_ascii=False)
-            self.db.execute("""
-                INSERT OR REPLACE INTO workflows (name, description, steps, category)
-                VALUES (?, ?, ?, ?)
-            """, (name, description, steps_str, category))
+            steps_str = _dumps(steps)
+            self.db.execute(_SQL_UPSERT_WORKFLOW, (name, description, steps_str, category))
+            self._invalidate_workflows()
             
             logger.info(f"Workflow saved: {name}")
             return True
@@ -217,7 +427,7 @@ class MemoryAgent:
             row = self.db.fetch_one("SELECT * FROM workflows WHERE name = ?", (name,))
             if row:
                 result = dict(row)
-                result['steps'] = json.loads(result['steps'])
+                result['steps'] = orjson.loads(result['steps'])
                 return result
             return None
         except Exception as e:
@@ -227,47 +437,36 @@ class MemoryAgent:
     def list_workflows(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all workflows"""
         try:
+            self.flush()
             if category:
-                rows = self.db.fetch_all(
-                    "SELECT * FROM workflows WHERE category = ? AND enabled = 1 ORDER BY name",
-                    (category,)
-                )
-            else:
-                rows = self.db.fetch_all(
-                    "SELECT * FROM workflows WHERE enabled = 1 ORDER BY name"
-                )
-            
-            workflows = []
-            for row in rows:
-                wf = dict(row)
-                wf['steps'] = json.loads(wf['steps'])
-                workflows.append(wf)
-            
-            return workflows
+                return self._cached_workflows(("list", category), _SQL_LIST_WORKFLOWS_IN, (category,))
+            return self._cached_workflows(("list",), _SQL_LIST_WORKFLOWS, ())
         except Exception as e:
             logger.error(f"Failed to list workflows: {e}")
             return []
     
-    def update_workflow_usage(self, name: str):
-        """Update workflow usage statistics"""
+    def delete_workflow(self, name: str) -> bool:
+        """Delete a workflow"""
         try:
-            self.db.execute("""
-                UPDATE workflows 
-                SET usage_count = usage_count + 1, last_used = CURRENT_TIMESTAMP
-                WHERE name = ?
-            """, (name,))
+            self.db.execute(_SQL_DELETE_WORKFLOW, (name,))
+            self._invalidate_workflows()
+            logger.info(f"Workflow deleted: {name}")
+            return True
         except Exception as e:
-            logger.error(f"Failed to update workflow usage: {e}")
+            logger.error(f"Failed to delete workflow: {e}")
+            return False
+    
+    def update_workflow_usage(self, name: str):
+        """Update workflow usage statistics (written on the next flush)"""
+        with self._usage_lock:
+            self._usage_counts[name] = self._usage_counts.get(name, 0) + 1
     
     def log_usage(self, command: str, agent: str, success: bool, 
                  duration_ms: int, metadata: Dict[str, Any] = None):
         """Log command usage statistics"""
         try:
-            metadata_str = json.dumps(metadata or {}, ensure_ascii=False)
-            self.db.execute("""
-                INSERT INTO usage_stats (command, agent, success, duration_ms, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            """, (command, agent, success, duration_ms, metadata_str))
+            metadata_str = _dumps(metadata or {})
+            self._enqueue(_SQL_INSERT_USAGE, (command, agent, success, duration_ms, metadata_str))
         except Exception as e:
             logger.error(f"Failed to log usage: {e}")
     
@@ -276,21 +475,17 @@ class MemoryAgent:
                          metadata: Dict[str, Any] = None):
         """Save conversation turn"""
         try:
-            metadata_str = json.dumps(metadata or {}, ensure_ascii=False)
-            self.db.execute("""
-                INSERT INTO conversations (user_input, agent_response, intent, confidence, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_input, agent_response, intent, confidence, metadata_str))
+            metadata_str = _dumps(metadata or {})
+            self._enqueue(_SQL_INSERT_CONVERSATION,
+                          (user_input, agent_response, intent, confidence, metadata_str))
         except Exception as e:
             logger.error(f"Failed to save conversation: {e}")
     
     def get_recent_conversations(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent conversation history"""
         try:
-            rows = self.db.fetch_all(
-                "SELECT * FROM conversations ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
-            )
+            self.flush()
+            rows = self.db.fetch_all(_SQL_RECENT_CONVERSATIONS, (limit,))
             return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Failed to get conversations: {e}")
@@ -299,11 +494,8 @@ class MemoryAgent:
     def set_preference(self, key: str, value: Any) -> bool:
         """Set user preference"""
         try:
-            value_str = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
-            self.db.execute("""
-                INSERT OR REPLACE INTO user_preferences (key, value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (key, value_str))
+            value_str = _dumps(value) if not isinstance(value, str) else value
+            self.db.execute(_SQL_UPSERT_PREFERENCE, (key, value_str))
             return True
         except Exception as e:
             logger.error(f"Failed to set preference: {e}")
@@ -315,8 +507,8 @@ class MemoryAgent:
             row = self.db.fetch_one("SELECT value FROM user_preferences WHERE key = ?", (key,))
             if row:
                 try:
-                    return json.loads(row['value'])
-                except json.JSONDecodeError:
+                    return orjson.loads(row['value'])
+                except orjson.JSONDecodeError:
                     return row['value']
             return default
         except Exception as e:
@@ -326,20 +518,8 @@ class MemoryAgent:
     def suggest_workflows(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Suggest workflows based on usage patterns"""
         try:
-            rows = self.db.fetch_all("""
-                SELECT * FROM workflows 
-                WHERE enabled = 1 
-                ORDER BY usage_count DESC, last_used DESC 
-                LIMIT ?
-            """, (limit,))
-            
-            suggestions = []
-            for row in rows:
-                wf = dict(row)
-                wf['steps'] = json.loads(wf['steps'])
-                suggestions.append(wf)
-            
-            return suggestions
+            self.flush()
+            return self._cached_workflows(("suggest", limit), _SQL_SUGGEST_WORKFLOWS, (limit,))
         except Exception as e:
             logger.error(f"Failed to suggest workflows: {e}")
             return []
@@ -4,6 +4,8 @@ User consent-based access control for all capabilities
 """
 
 import json
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from enum import Enum
@@ -15,6 +17,9 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# How long check_permission_cached reuses a grant before asking again
+PERMISSION_CACHE_TTL = 30.0
+
 class PermissionType(Enum):
     """Types of permissions in Atlas"""
     FILES = "files"
@@ -32,6 +37,9 @@ class RiskLevel(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+# Only these grants are reused; HIGH/CRITICAL actions are always checked afresh
+_CACHEABLE_RISKS = frozenset({RiskLevel.LOW, RiskLevel.MEDIUM})
+
 @dataclass
 class PermissionRequest:
     """Represents a permission request"""
@@ -83,6 +91,16 @@ class PermissionManager:
     def __init__(self):
         self.pending_requests: List[PermissionRequest] = []
         self._load_pending_requests()
+        
+        # Connectors check permissions from worker threads (e.g. bulk_send);
+        # these serialize the pending-request list/file and audit log writes
+        self._requests_lock = threading.RLock()
+        self._audit_lock = threading.Lock()
+        
+        # (type, action, risk, scope) -> monotonic time of the grant, for
+        # one config revision so policy changes take effect at once
+        self._grants: Dict[tuple, float] = {}
+        self._grants_revision = config.revision
     
     def _load_pending_requests(self):
         """Load pending permission requests from disk"""
@@ -107,7 +125,7 @@ class PermissionManager:
     def _save_pending_requests(self):
         """Save pending requests to disk"""
         try:
-            with open(self.PENDING_REQUESTS_FILE, 'w', encoding='utf-8') as f:
+            with self._requests_lock, open(self.PENDING_REQUESTS_FILE, 'w', encoding='utf-8') as f:
                 data = [req.to_dict() for req in self.pending_requests]
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
@@ -160,8 +178,9 @@ class PermissionManager:
                 params=params,
                 timestamp=datetime.now()
             )
-            self.pending_requests.append(request)
-            self._save_pending_requests()
+            with self._requests_lock:
+                self.pending_requests.append(request)
+                self._save_pending_requests()
             
             logger.info(f"Permission request created for: {action}")
             return False, "User confirmation required. Check pending requests."
@@ -171,6 +190,44 @@ class PermissionManager:
                       params, "system")
         return True, None
     
+    def check_permission_cached(self, permission_type: PermissionType, action: str,
+                                risk_level: RiskLevel = RiskLevel.MEDIUM,
+                                params: Dict[str, Any] = None, scope: tuple = (),
+                                ttl: float = PERMISSION_CACHE_TTL) -> tuple[bool, Optional[str]]:
+        """
+        check_permission, reusing LOW/MEDIUM grants for `ttl` seconds
+        A grant only covers calls with the same `scope` (the params it is
+        tied to, e.g. the target path); reused grants are still audited
+        """
+        params = params or {}
+        if self._grants_revision != config.revision:
+            self.invalidate_grants()
+        
+        cacheable = risk_level in _CACHEABLE_RISKS
+        key = (permission_type, action, risk_level, scope)
+        if cacheable:
+            granted_at = self._grants.get(key)
+            if granted_at is not None and time.monotonic() - granted_at < ttl:
+                self.audit_grant(permission_type, action, risk_level, params)
+                return True, None
+        
+        # Denials are never cached so "ask every time" keeps creating requests
+        granted, reason = self.check_permission(permission_type, action, risk_level, params)
+        if granted and cacheable:
+            self._grants[key] = time.monotonic()
+        return granted, reason
+    
+    def audit_grant(self, permission_type: PermissionType, action: str,
+                    risk_level: RiskLevel, params: Dict[str, Any]):
+        """Record a grant decided without check_permission"""
+        self._log_audit(action, permission_type.value, risk_level.value, "granted",
+                        params, "system")
+    
+    def invalidate_grants(self):
+        """Drop grants reused by check_permission_cached"""
+        self._grants.clear()
+        self._grants_revision = config.revision
+    
     def _get_action_description(self, action: str, params: Dict[str, Any]) -> str:
         """Generate human-readable description of action"""
         descriptions = {
@@ -189,20 +246,22 @@ class PermissionManager:
     def approve_request(self, request_index: int) -> bool:
         """Approve a pending permission request"""
         try:
-            if 0 <= request_index < len(self.pending_requests):
+            with self._requests_lock:
+                if not 0 <= request_index < len(self.pending_requests):
+                    return False
                 request = self.pending_requests.pop(request_index)
                 self._save_pending_requests()
-                
-                self._log_audit(
-                    request.action, 
-                    request.permission_type.value, 
-                    request.risk_level.value, 
-                    "approved", 
-                    request.params, 
-                    "user"
-                )
-                logger.info(f"Request approved: {request.action}")
-                return True
+            
+            self._log_audit(
+                request.action, 
+                request.permission_type.value, 
+                request.risk_level.value, 
+                "approved", 
+                request.params, 
+                "user"
+            )
+            logger.info(f"Request approved: {request.action}")
+            return True
         except Exception as e:
             logger.error(f"Failed to approve request: {e}")
         return False
@@ -210,27 +269,30 @@ class PermissionManager:
     def deny_request(self, request_index: int) -> bool:
         """Deny a pending permission request"""
         try:
-            if 0 <= request_index < len(self.pending_requests):
+            with self._requests_lock:
+                if not 0 <= request_index < len(self.pending_requests):
+                    return False
                 request = self.pending_requests.pop(request_index)
                 self._save_pending_requests()
-                
-                self._log_audit(
-                    request.action, 
-                    request.permission_type.value, 
-                    request.risk_level.value, 
-                    "denied_by_user", 
-                    request.params, 
-                    "user"
-                )
-                logger.info(f"Request denied: {request.action}")
-                return True
+            
+            self._log_audit(
+                request.action, 
+                request.permission_type.value, 
+                request.risk_level.value, 
+                "denied_by_user", 
+                request.params, 
+                "user"
+            )
+            logger.info(f"Request denied: {request.action}")
+            return True
         except Exception as e:
             logger.error(f"Failed to deny request: {e}")
         return False
     
     def get_pending_requests(self) -> List[Dict[str, Any]]:
         """Get all pending permission requests"""
-        return [req.to_dict() for req in self.pending_requests]
+        with self._requests_lock:
+            return [req.to_dict() for req in self.pending_requests]
     
     def _log_audit(self, action: str, permission_type: str, risk_level: str,
                   status: str, details: Dict[str, Any], agent: str):
@@ -246,8 +308,9 @@ class PermissionManager:
         )
         
         try:
-            with open(self.AUDIT_LOG_FILE, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n')
+            line = json.dumps(entry.to_dict(), ensure_ascii=False) + '\n'
+            with self._audit_lock, open(self.AUDIT_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(line)
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
     
@@ -238,7 +238,7 @@ class WorkflowEngine:
                 "workflow_name": workflow_name,
                 "steps_executed": len(result.step_results),
                 "duration_ms": result.total_duration_ms,
-                "results": result.step_results
+                "results": result.as_dicts()
             }
         
         except Exception as e:
@@ -347,7 +347,11 @@ class WorkflowEngine:
         """Delete a workflow"""
         try:
             # Delete from memory database
-            memory_agent.db.execute("DELETE FROM workflows WHERE name = ?", (name,))
+            if not memory_agent.delete_workflow(name):
+                return {
+                    "success": False,
+                    "message": "Failed to delete workflow"
+                }
             
             # Delete template file
             template_file = self.templates_dir / f"{name}.json"